@@ -0,0 +1,310 @@
+"""Baseline schema
+
+Matches the tables that models.Base.metadata.create_all produced before
+migrations were introduced. Existing databases should be stamped at this
+revision (alembic stamp 0001_baseline) instead of running it.
+
+Revision ID: 0001_baseline
+Revises: 
+Create Date: 2026-10-16 04:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_baseline'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('benefits',
+    sa.Column('benefit_id', sa.Integer(), nullable=False),
+    sa.Column('benefit_name', sa.String(), nullable=False),
+    sa.Column('benefit_description', sa.Text(), nullable=False),
+    sa.Column('benefit_type', sa.String(), nullable=False),
+    sa.Column('max_amount', sa.Float(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('grades', postgresql.ARRAY(sa.String()), nullable=True),
+    sa.PrimaryKeyConstraint('benefit_id')
+    )
+    op.create_table('courses',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('category', sa.Enum('TECH', 'HR', 'MARKETING', 'FINANCE', name='coursecategory'), nullable=False),
+    sa.Column('instructor', sa.String(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('duration', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('course_id')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('employee_id', sa.String(), nullable=False),
+    sa.Column('department', sa.Enum('ENGINEERING', 'HUMAN_RESOURCES', 'MARKETING', 'FINANCE', name='departmentenum'), nullable=False),
+    sa.Column('position', sa.String(), nullable=False),
+    sa.Column('manager_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('grade', sa.String(length=100), nullable=True),
+    sa.Column('doj', sa.DateTime(), nullable=True),
+    sa.Column('linemanager', sa.String(length=1000), nullable=True),
+    sa.Column('workphone', sa.String(length=100), nullable=True),
+    sa.Column('mobilephone', sa.String(length=200), nullable=True),
+    sa.Column('bankname', sa.String(length=4000), nullable=True),
+    sa.Column('branchname', sa.String(length=4000), nullable=True),
+    sa.Column('gender', sa.String(length=20), nullable=False),
+    sa.Column('sbu', sa.String(length=100), nullable=True),
+    sa.Column('religion', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['manager_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('employee_id')
+    )
+    op.create_table('bank_letter_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('bank_name', sa.String(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('approver_comments', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('benefit_enrollments',
+    sa.Column('enrollment_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('benefit_id', sa.Integer(), nullable=False),
+    sa.Column('enrollment_status', sa.String(), nullable=True),
+    sa.Column('enrollment_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('rejection_reason', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['benefit_id'], ['benefits.benefit_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('enrollment_id')
+    )
+    op.create_table('completions',
+    sa.Column('completion_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('certificate_url', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.course_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('completion_id')
+    )
+    op.create_table('enrollments',
+    sa.Column('enrollment_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('enrolled_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('progress', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.course_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('enrollment_id')
+    )
+    op.create_table('leave_balances',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('leave_type', sa.String(), nullable=False),
+    sa.Column('total_days', sa.Float(), nullable=False),
+    sa.Column('used_days', sa.Float(), nullable=True),
+    sa.Column('remaining_days', sa.Float(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('leave_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('leave_type', sa.String(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('days_requested', sa.Float(), nullable=False),
+    sa.Column('reason', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('approver_comments', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('payslips',
+    sa.Column('payslip_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('basic_salary', sa.Float(), nullable=False),
+    sa.Column('allowances', sa.Float(), nullable=True),
+    sa.Column('deductions', sa.Float(), nullable=True),
+    sa.Column('net_salary', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('approver_comments', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('payslip_id'),
+    sa.UniqueConstraint('user_id', 'month', 'year', name='uix_user_month_year')
+    )
+    op.create_table('performance_goals',
+    sa.Column('goal_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('target_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('goal_for', sa.String(), nullable=False),
+    sa.Column('progress', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('goal_id')
+    )
+    op.create_table('salary_structures',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('basic_salary', sa.Float(), nullable=False),
+    sa.Column('allowances', sa.JSON(), nullable=False),
+    sa.Column('deductions', sa.JSON(), nullable=False),
+    sa.Column('effective_date', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('visa_letter_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.Column('language', sa.String(), nullable=False),
+    sa.Column('addressed_to', sa.String(), nullable=False),
+    sa.Column('country', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('approver_comments', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('attachments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('file_name', sa.String(), nullable=False),
+    sa.Column('file_type', sa.String(), nullable=False),
+    sa.Column('file_desc', sa.String(), nullable=True),
+    sa.Column('file_data', sa.Text(), nullable=False),
+    sa.Column('bank_letter_request_id', sa.Integer(), nullable=True),
+    sa.Column('visa_letter_request_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['bank_letter_request_id'], ['bank_letter_requests.id'], ),
+    sa.ForeignKeyConstraint(['visa_letter_request_id'], ['visa_letter_requests.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('performance_reviews',
+    sa.Column('review_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('goal_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('overall_rating', sa.Integer(), nullable=True),
+    sa.Column('achievements', sa.Text(), nullable=True),
+    sa.Column('areas_for_improvement', sa.Text(), nullable=True),
+    sa.Column('rating_quality', sa.Integer(), nullable=True),
+    sa.Column('rating_productivity', sa.Integer(), nullable=True),
+    sa.Column('rating_communication', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('approver_rating_overall', sa.Integer(), nullable=True),
+    sa.Column('approver_comments', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['goal_id'], ['performance_goals.goal_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('review_id')
+    )
+    op.create_table('overtime_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('hours', sa.Float(), nullable=False),
+    sa.Column('reason', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('approver_comments', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('attachment_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['attachment_id'], ['attachments.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('overtime_leaves',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('overtime_request_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('ot_hours', sa.Float(), nullable=False),
+    sa.Column('leave_days', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['overtime_request_id'], ['overtime_requests.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_benefits_benefit_id'), 'benefits', ['benefit_id'], unique=False)
+    op.create_index(op.f('ix_courses_course_id'), 'courses', ['course_id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_bank_letter_requests_id'), 'bank_letter_requests', ['id'], unique=False)
+    op.create_index(op.f('ix_benefit_enrollments_enrollment_id'), 'benefit_enrollments', ['enrollment_id'], unique=False)
+    op.create_index(op.f('ix_completions_completion_id'), 'completions', ['completion_id'], unique=False)
+    op.create_index(op.f('ix_enrollments_enrollment_id'), 'enrollments', ['enrollment_id'], unique=False)
+    op.create_index(op.f('ix_leave_balances_id'), 'leave_balances', ['id'], unique=False)
+    op.create_index(op.f('ix_leave_requests_id'), 'leave_requests', ['id'], unique=False)
+    op.create_index(op.f('ix_payslips_payslip_id'), 'payslips', ['payslip_id'], unique=False)
+    op.create_index(op.f('ix_performance_goals_goal_id'), 'performance_goals', ['goal_id'], unique=False)
+    op.create_index(op.f('ix_salary_structures_id'), 'salary_structures', ['id'], unique=False)
+    op.create_index(op.f('ix_visa_letter_requests_id'), 'visa_letter_requests', ['id'], unique=False)
+    op.create_index(op.f('ix_attachments_id'), 'attachments', ['id'], unique=False)
+    op.create_index(op.f('ix_performance_reviews_review_id'), 'performance_reviews', ['review_id'], unique=False)
+    op.create_index(op.f('ix_overtime_requests_id'), 'overtime_requests', ['id'], unique=False)
+    op.create_index(op.f('ix_overtime_leaves_id'), 'overtime_leaves', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('overtime_leaves')
+    op.drop_table('overtime_requests')
+    op.drop_table('performance_reviews')
+    op.drop_table('attachments')
+    op.drop_table('visa_letter_requests')
+    op.drop_table('salary_structures')
+    op.drop_table('performance_goals')
+    op.drop_table('payslips')
+    op.drop_table('leave_requests')
+    op.drop_table('leave_balances')
+    op.drop_table('enrollments')
+    op.drop_table('completions')
+    op.drop_table('benefit_enrollments')
+    op.drop_table('bank_letter_requests')
+    op.drop_table('users')
+    op.drop_table('courses')
+    op.drop_table('benefits')
+    sa.Enum(name='coursecategory').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='departmentenum').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,46 @@
+"""Index request status columns and per-user listings
+
+Revision ID: 0002_request_status_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-16 04:55:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_request_status_indexes'
+down_revision: Union[str, None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_leave_requests_status', 'leave_requests', ['status']),
+    ('ix_leave_user_status_created', 'leave_requests', ['user_id', 'status', 'created_at']),
+    ('ix_bank_letter_requests_status', 'bank_letter_requests', ['status']),
+    ('ix_bank_letter_user_status_created', 'bank_letter_requests', ['user_id', 'status', 'created_at']),
+    ('ix_visa_letter_requests_status', 'visa_letter_requests', ['status']),
+    ('ix_visa_letter_user_status_created', 'visa_letter_requests', ['user_id', 'status', 'created_at']),
+    ('ix_benefit_enrollments_enrollment_status', 'benefit_enrollments', ['enrollment_status']),
+    ('ix_benefit_enrollment_user_status_created', 'benefit_enrollments', ['user_id', 'enrollment_status', 'created_at']),
+    ('ix_performance_reviews_status', 'performance_reviews', ['status']),
+    ('ix_performance_review_user_status_created', 'performance_reviews', ['user_id', 'status', 'created_at']),
+    ('ix_overtime_requests_status', 'overtime_requests', ['status']),
+    ('ix_overtime_user_status_created', 'overtime_requests', ['user_id', 'status', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,35 @@
+"""Store attachment file_data as bytea
+
+Revision ID: 0003_attachment_file_data_bytea
+Revises: 0002_request_status_indexes
+Create Date: 2026-10-16 05:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_attachment_file_data_bytea'
+down_revision: Union[str, None] = '0002_request_status_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'attachments', 'file_data',
+        type_=sa.LargeBinary(),
+        existing_nullable=False,
+        postgresql_using="decode(file_data, 'base64')",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'attachments', 'file_data',
+        type_=sa.Text(),
+        existing_nullable=False,
+        postgresql_using="encode(file_data, 'base64')",
+    )
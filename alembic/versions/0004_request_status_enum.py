@@ -0,0 +1,53 @@
+"""Store workflow status columns as the native request_status enum
+
+Revision ID: 0004_request_status_enum
+Revises: 0003_attachment_file_data_bytea
+Create Date: 2026-10-16 05:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_request_status_enum'
+down_revision: Union[str, None] = '0003_attachment_file_data_bytea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+request_status = postgresql.ENUM('pending', 'approved', 'rejected', 'completed', name='request_status')
+
+# (table, column)
+STATUS_COLUMNS = [
+    ('leave_requests', 'status'),
+    ('bank_letter_requests', 'status'),
+    ('visa_letter_requests', 'status'),
+    ('payslips', 'status'),
+    ('benefit_enrollments', 'enrollment_status'),
+    ('performance_reviews', 'status'),
+    ('overtime_requests', 'status'),
+]
+
+
+def upgrade() -> None:
+    request_status.create(op.get_bind(), checkfirst=True)
+    for table, column in STATUS_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=request_status,
+            existing_type=sa.String(),
+            postgresql_using=f"{column}::request_status",
+        )
+
+
+def downgrade() -> None:
+    for table, column in STATUS_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.String(),
+            existing_type=request_status,
+            postgresql_using=f"{column}::text",
+        )
+    request_status.drop(op.get_bind(), checkfirst=True)
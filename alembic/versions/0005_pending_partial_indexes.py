@@ -0,0 +1,45 @@
+"""Partial indexes over pending rows for the pending requests dashboard
+
+Revision ID: 0005_pending_partial_indexes
+Revises: 0004_request_status_enum
+Create Date: 2026-10-16 05:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_pending_partial_indexes'
+down_revision: Union[str, None] = '0004_request_status_enum'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, status column)
+INDEXES = [
+    ('ix_leave_pending', 'leave_requests', 'status'),
+    ('ix_bank_letter_pending', 'bank_letter_requests', 'status'),
+    ('ix_visa_letter_pending', 'visa_letter_requests', 'status'),
+    ('ix_payslip_pending', 'payslips', 'status'),
+    ('ix_benefit_enrollment_pending', 'benefit_enrollments', 'enrollment_status'),
+    ('ix_performance_review_pending', 'performance_reviews', 'status'),
+    ('ix_overtime_pending', 'overtime_requests', 'status'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name, table, ['user_id', 'created_at'],
+                postgresql_where=sa.text(f"{column} = 'pending'"),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,32 @@
+"""Covering index for the login lookup by email
+
+Revision ID: 0006_users_email_login_index
+Revises: 0005_pending_partial_indexes
+Create Date: 2026-10-16 05:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_users_email_login_index'
+down_revision: Union[str, None] = '0005_pending_partial_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email_login', 'users', ['email'],
+            postgresql_include=['hashed_password', 'is_active', 'id', 'username'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_email_login', table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,31 @@
+"""Index bank letter requests by (created_at, id) for keyset pagination
+
+Revision ID: 0007_bank_letter_keyset_index
+Revises: 0006_users_email_login_index
+Create Date: 2026-10-16 05:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_bank_letter_keyset_index'
+down_revision: Union[str, None] = '0006_users_email_login_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_bank_letter_created_id', 'bank_letter_requests', ['created_at', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_bank_letter_created_id', table_name='bank_letter_requests', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,73 @@
+"""Cascade user deletes in the database and index the remaining user_id foreign keys
+
+Revision ID: 0008_user_fk_on_delete_cascade
+Revises: 0007_bank_letter_keyset_index
+Create Date: 2026-10-16 06:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_user_fk_on_delete_cascade'
+down_revision: Union[str, None] = '0007_bank_letter_keyset_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referred table, ON DELETE action); the constraints were created
+# unnamed, so they carry PostgreSQL's default <table>_<column>_fkey names
+FOREIGN_KEYS = [
+    ('leave_requests', 'user_id', 'users', 'CASCADE'),
+    ('bank_letter_requests', 'user_id', 'users', 'CASCADE'),
+    ('visa_letter_requests', 'user_id', 'users', 'CASCADE'),
+    ('payslips', 'user_id', 'users', 'CASCADE'),
+    ('salary_structures', 'user_id', 'users', 'CASCADE'),
+    ('benefit_enrollments', 'user_id', 'users', 'CASCADE'),
+    ('performance_goals', 'user_id', 'users', 'CASCADE'),
+    ('performance_reviews', 'user_id', 'users', 'CASCADE'),
+    ('overtime_requests', 'user_id', 'users', 'CASCADE'),
+    ('overtime_leaves', 'user_id', 'users', 'CASCADE'),
+    ('attachments', 'bank_letter_request_id', 'bank_letter_requests', 'SET NULL'),
+    ('attachments', 'visa_letter_request_id', 'visa_letter_requests', 'SET NULL'),
+]
+
+# Cascading deletes look children up by user_id, so every cascaded table needs an index leading with it
+INDEXES = [
+    ('ix_leave_balance_user_type_year', 'leave_balances', ['user_id', 'leave_type', 'year'], {}),
+    ('ix_salary_structures_user_id', 'salary_structures', ['user_id'], {}),
+    ('ix_performance_goals_user_id', 'performance_goals', ['user_id'], {}),
+    ('ix_overtime_leave_user_year', 'overtime_leaves', ['user_id', 'year'], {'postgresql_include': ['leave_days']}),
+]
+
+
+def _replace_foreign_keys(ondelete: bool) -> None:
+    for table, column, referred, action in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(
+            name, table, referred, [column], ['id'],
+            ondelete=action if ondelete else None,
+        )
+
+
+def upgrade() -> None:
+    _replace_foreign_keys(ondelete=True)
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    _replace_foreign_keys(ondelete=False)
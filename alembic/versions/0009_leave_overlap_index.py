@@ -0,0 +1,32 @@
+"""Partial index for the overlapping leave request check
+
+Revision ID: 0009_leave_overlap_index
+Revises: 0008_user_fk_on_delete_cascade
+Create Date: 2026-10-16 06:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_leave_overlap_index'
+down_revision: Union[str, None] = '0008_user_fk_on_delete_cascade'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_lr_user_status_dates', 'leave_requests', ['user_id', 'status', 'start_date', 'end_date'],
+            postgresql_where=sa.text("status IN ('pending', 'approved')"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_lr_user_status_dates', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,31 @@
+"""Index users.manager_id for subordinate and pending approval lookups
+
+Revision ID: 0010_users_manager_id_index
+Revises: 0009_leave_overlap_index
+Create Date: 2026-10-16 07:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0010_users_manager_id_index'
+down_revision: Union[str, None] = '0009_leave_overlap_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_manager_id', 'users', ['manager_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_manager_id', table_name='users', postgresql_concurrently=True, if_exists=True)
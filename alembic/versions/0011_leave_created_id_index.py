@@ -0,0 +1,31 @@
+"""Index leave requests by (created_at, id) for keyset pagination
+
+Revision ID: 0011_leave_created_id_index
+Revises: 0010_users_manager_id_index
+Create Date: 2026-10-16 07:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0011_leave_created_id_index'
+down_revision: Union[str, None] = '0010_users_manager_id_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_leave_created_id', 'leave_requests', ['created_at', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_leave_created_id', table_name='leave_requests', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,37 @@
+"""Index enrollments and completions by (user_id, date) for year-range filters
+
+Revision ID: 0012_lms_user_date_indexes
+Revises: 0011_leave_created_id_index
+Create Date: 2026-10-16 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0012_lms_user_date_indexes'
+down_revision: Union[str, None] = '0011_leave_created_id_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_enrollments_user_enrolled', 'enrollments', ['user_id', 'enrolled_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_completions_user_completed', 'completions', ['user_id', 'completed_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_completions_user_completed', table_name='completions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_enrollments_user_enrolled', table_name='enrollments', postgresql_concurrently=True, if_exists=True)
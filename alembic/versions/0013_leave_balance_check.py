@@ -0,0 +1,32 @@
+"""Refuse negative leave balances with a CHECK constraint
+
+Revision ID: 0013_leave_balance_check
+Revises: 0012_lms_user_date_indexes
+Create Date: 2026-10-16 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0013_leave_balance_check'
+down_revision: Union[str, None] = '0012_lms_user_date_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NOT VALID adds the constraint without scanning existing rows, so its ACCESS EXCLUSIVE lock is brief
+    op.execute(
+        "ALTER TABLE leave_balances ADD CONSTRAINT ck_leave_balance_remaining_nonnegative "
+        "CHECK (remaining_days >= 0) NOT VALID"
+    )
+    # Commit that first: VALIDATE only takes SHARE UPDATE EXCLUSIVE, which still allows reads and
+    # writes, but inside the same transaction the exclusive lock above would be held through the scan
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE leave_balances VALIDATE CONSTRAINT ck_leave_balance_remaining_nonnegative")
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_leave_balance_remaining_nonnegative', 'leave_balances', type_='check')
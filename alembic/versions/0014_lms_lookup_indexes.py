@@ -0,0 +1,44 @@
+"""Index course listings and per-user enrollment/completion lookups
+
+Revision ID: 0014_lms_lookup_indexes
+Revises: 0013_leave_balance_check
+Create Date: 2026-10-16 09:55:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0014_lms_lookup_indexes'
+down_revision: Union[str, None] = '0013_leave_balance_check'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, kwargs)
+INDEXES = [
+    ('ix_courses_active_category_start', 'courses', ['category', 'start_date'], {'postgresql_where': sa.text('is_active')}),
+    ('ix_enrollments_user_course', 'enrollments', ['user_id', 'course_id'], {}),
+    ('ix_completions_user_course', 'completions', ['user_id', 'course_id'], {}),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+        # Give the planner statistics for the new indexes right away
+        for table in ('courses', 'enrollments', 'completions'):
+            op.execute(f'ANALYZE {table}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,42 @@
+"""Index overtime requests by (user_id, date) and overtime leaves by request
+
+Revision ID: 0015_overtime_date_indexes
+Revises: 0014_lms_lookup_indexes
+Create Date: 2026-10-16 10:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0015_overtime_date_indexes'
+down_revision: Union[str, None] = '0014_lms_lookup_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, kwargs)
+INDEXES = [
+    ('ix_overtime_user_date', 'overtime_requests', ['user_id', 'date'], {}),
+    ('ix_overtime_leave_request', 'overtime_leaves', ['overtime_request_id'], {'postgresql_include': ['leave_days']}),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+        # Give the planner statistics for the new indexes right away
+        for table in ('overtime_requests', 'overtime_leaves'):
+            op.execute(f'ANALYZE {table}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
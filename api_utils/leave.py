@@ -1,14 +1,31 @@
+from functools import lru_cache
 from models import User
 
+def _normalized(value) -> str:
+    return value.strip().lower() if value else ""
+
+# Leave types restricted to a subset of employees; all other leave types are allowed for everyone.
+# Rules take the normalized (gender, religion) pair, which is all eligibility depends on.
+_ELIGIBILITY_RULES = {
+    "maternity": lambda gender, religion: gender == "female",
+    "paternity": lambda gender, religion: gender == "male",
+    "hajj": lambda gender, religion: religion == "muslim",
+}
+
+def _is_eligible(leave_type: str, gender: str, religion: str) -> bool:
+    rule = _ELIGIBILITY_RULES.get(leave_type.lower())
+    return rule is None or rule(gender, religion)
+
 def is_leave_type_eligible(user: User, leave_type: str) -> bool:
-    leave_type = leave_type.lower()
-    gender = user.gender.strip().lower() if user.gender else ""
-    religion = user.religion.strip().lower() if hasattr(user, 'religion') and user.religion else ""
-    if leave_type == "maternity":
-        return gender == "female"
-    if leave_type == "paternity":
-        return gender == "male"
-    if leave_type == "hajj":
-        return religion == "muslim"
-    # All other leave types are allowed for everyone
-    return True 
\ No newline at end of file
+    return _is_eligible(leave_type, _normalized(user.gender), _normalized(getattr(user, "religion", None)))
+
+@lru_cache(maxsize=64)
+def _eligible_leave_types(leave_types: tuple, gender: str, religion: str) -> tuple:
+    return tuple(leave_type for leave_type in leave_types if _is_eligible(leave_type, gender, religion))
+
+def eligible_leave_types(user: User, leave_types: tuple) -> tuple:
+    """
+    The subset of leave_types the user may apply for, in the given order.
+    Cached per (gender, religion) since nothing else about the user affects eligibility.
+    """
+    return _eligible_leave_types(leave_types, _normalized(user.gender), _normalized(getattr(user, "religion", None)))
@@ -1,5 +1,11 @@
 from datetime import datetime
 import calendar
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Numba is optional; the batch API falls back to plain NumPy
+    numba = None
 
 def calculate_overtime_entitlement(user, date, hours, grade, year_total_hours):
     """
@@ -71,4 +77,61 @@ def calculate_overtime_entitlement(user, date, hours, grade, year_total_hours):
         'entitled_leave_days': entitled_hours / 8,
         'capped': capped,
         'message': message
-    } 
\ No newline at end of file
+    }
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def _overtime_kernel(grades, weekdays, hours, year_totals, out_entitled, out_leave_days):
+        for i in numba.prange(grades.shape[0]):
+            multiplier = 2.0 if weekdays[i] >= 5 else 1.5
+            counted_hours = hours[i]
+            if (grades[i] == 4 or grades[i] == 5) and counted_hours > 4.0:
+                counted_hours = 4.0
+            out_entitled[i] = counted_hours * multiplier
+            out_leave_days[i] = np.floor((year_totals[i] + out_entitled[i]) / 8.0)
+
+
+def calculate_overtime_entitlement_batch(grades, dates, hours, year_totals):
+    """
+    Vectorized counterpart of calculate_overtime_entitlement for many requests at once.
+    Args:
+        grades: array-like of int, user grade (1-5) per request
+        dates: array-like of datetime.date / 'YYYY-MM-DD' / datetime64, OT date per request
+        hours: array-like of float, number of OT hours per request
+        year_totals: array-like of float, total OT hours already approved for the year per request
+    Returns:
+        dict of NumPy arrays: {
+            'entitled_hours': float64,
+            'entitled_leave_days': float64,
+            'leave_days': float64 (total leave days for the year incl. this request),
+            'capped': bool
+        }
+    """
+    grades = np.asarray(grades, dtype=np.int64)
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    hours = np.asarray(hours, dtype=np.float64)
+    year_totals = np.asarray(year_totals, dtype=np.float64)
+
+    # 1970-01-01 was a Thursday, so shift by 3 to get 0=Mon ... 6=Sun
+    weekdays = (dates.astype(np.int64) + 3) % 7
+
+    if numba is not None:
+        entitled_hours = np.empty_like(hours)
+        leave_days = np.empty_like(hours)
+        _overtime_kernel(grades, weekdays, hours, year_totals, entitled_hours, leave_days)
+    else:
+        multiplier = np.where(weekdays >= 5, 2.0, 1.5)
+
+        # Grades 4-5 only count the first 4 hours per day
+        counted_hours = np.where((grades == 4) | (grades == 5), np.minimum(hours, 4), hours)
+        entitled_hours = counted_hours * multiplier
+
+        leave_days = np.floor((year_totals + entitled_hours) / 8)
+
+    return {
+        'entitled_hours': entitled_hours,
+        'entitled_leave_days': entitled_hours / 8,
+        'leave_days': leave_days,
+        'capped': leave_days > 9
+    }
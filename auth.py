@@ -1,14 +1,20 @@
+import hashlib
+import hmac
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, load_only, make_transient_to_detached
 from database import get_db
 from models import User
 from schemas import TokenData
-from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, LOGIN_CACHE_SECONDS
+from cache import auth_user_cache, login_cache, get_or_load, peek, store, invalidate, redis_client
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -20,11 +26,24 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
+    # Login only needs identity and credentials, not the full profile row
+    user = db.query(User).options(
+        load_only(User.id, User.username, User.email, User.hashed_password, User.is_active)
+    ).filter(User.email == email).first()
     if not user:
         return False
+    if not LOGIN_CACHE_SECONDS:
+        return user if verify_password(password, user.hashed_password) else False
+    # Repeat logins with the same credentials skip bcrypt; only successes are cached, and the
+    # entry is tied to the stored hash so a password change invalidates it immediately
+    key = hmac.new(SECRET_KEY.encode(), f"{email}:{password}".encode(), hashlib.sha256).hexdigest()
+    cached_hash = peek(login_cache, key)
+    if cached_hash is not None and hmac.compare_digest(cached_hash, user.hashed_password):
+        return user
     if not verify_password(password, user.hashed_password):
+        invalidate(login_cache, key)
         return False
+    store(login_cache, key, user.hashed_password)
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -33,11 +52,34 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def revoke_token(token: str) -> bool:
+    """
+    Mark a token as revoked until it would have expired anyway.
+    Returns False when no Redis is configured, in which case logout stays client-side only.
+    """
+    if redis_client is None:
+        return False
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    jti = payload.get("jti")
+    if jti is None:
+        return False
+    ttl_seconds = int(payload["exp"] - time.time())
+    if ttl_seconds > 0:
+        redis_client.setex(f"revoked:{jti}", ttl_seconds, "1")
+    return True
+
+def is_token_revoked(jti: Optional[str]) -> bool:
+    return redis_client is not None and jti is not None and redis_client.exists(f"revoked:{jti}") > 0
+
+def _current_user_row(token: str, db: Session) -> dict:
+    """
+    Validate the bearer token and return the current user's column values.
+    Served from a short-lived cache keyed by the token signature, so repeated calls skip the SELECT.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -51,12 +93,38 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = TokenData(username=email)
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.email == token_data.username).first()
-    if user is None:
+    if is_token_revoked(payload.get("jti")):
         raise credentials_exception
-    return user
+    
+    def load_user_row():
+        user = db.query(User).filter(User.email == token_data.username).first()
+        if user is None:
+            return None
+        return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    
+    user_row = get_or_load(auth_user_cache, token.rsplit(".", 1)[-1], load_user_row)
+    if user_row is None:
+        raise credentials_exception
+    return user_row
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    user_row = _current_user_row(token, db)
+    # Attach a fresh instance to this request's session without querying; returns the loaded one on a miss
+    user = User(**user_row)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user 
\ No newline at end of file
+    return current_user
+
+def get_current_active_user_id(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> int:
+    """
+    get_current_active_user for endpoints that only need the caller's id: no User instance is built
+    or merged into the session.
+    """
+    user_row = _current_user_row(token, db)
+    if not user_row["is_active"]:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return user_row["id"]
@@ -0,0 +1,117 @@
+import threading
+import redis
+import redis.asyncio
+from cachetools import TTLCache
+from pydantic import TypeAdapter
+from config import REDIS_URL, LOGIN_CACHE_SECONDS
+
+# Shared Redis client for state that must be visible to every worker; None when REDIS_URL is not set
+redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True) if REDIS_URL else None
+async_redis_client = redis.asyncio.Redis.from_url(REDIS_URL) if REDIS_URL else None
+SHARED_CACHE_TTL = 300
+
+# In-process caches for reference data that is read on most requests but rarely written.
+# Each worker process keeps its own copy, so entries are also bounded by a short TTL
+# in case another worker (or a script) changes the underlying rows.
+leave_balance_cache = TTLCache(maxsize=10_000, ttl=300)        # user_id -> [LeaveBalanceResponse]
+salary_structure_cache = TTLCache(maxsize=10_000, ttl=300)     # user_id -> SalaryStructureResponse
+benefits_cache = TTLCache(maxsize=1, ttl=300)                  # "active" -> [BenefitResponse]
+auth_user_cache = TTLCache(maxsize=10_000, ttl=30)             # token signature -> User column values
+overtime_leave_cache = TTLCache(maxsize=10_000, ttl=300)       # (user_id, year) -> OT leave days
+manager_cache = TTLCache(maxsize=10_000, ttl=60)               # user_id -> has direct reports
+team_cache = TTLCache(maxsize=10_000, ttl=300)                 # manager_id -> [direct report ids]
+# Opt-in (LOGIN_CACHE_SECONDS > 0): lets repeated identical logins skip bcrypt
+login_cache = TTLCache(maxsize=1024, ttl=max(LOGIN_CACHE_SECONDS, 1))  # hmac(email:password) -> verified hash
+
+# TTLCache is not thread-safe and sync endpoints run on the threadpool
+_lock = threading.Lock()
+# Distinguishes a miss from a cached None, so negative lookups are also served for the TTL
+_MISSING = object()
+
+def get_or_load(cache: TTLCache, key, loader):
+    """
+    Return the cached value for key, calling loader() and caching its result (None included) on a miss.
+    loader runs outside the lock, so two concurrent misses may both hit the database.
+    """
+    with _lock:
+        value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = loader()
+        with _lock:
+            cache[key] = value
+    return value
+
+async def get_or_load_async(cache: TTLCache, key, loader):
+    """
+    get_or_load for async endpoints: loader() returns an awaitable. The lock is never held across an await.
+    """
+    with _lock:
+        value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = await loader()
+        with _lock:
+            cache[key] = value
+    return value
+
+async def get_or_load_shared(cache: TTLCache, key, redis_key: str, adapter: TypeAdapter, loader):
+    """
+    Look-aside cache for async endpoints. With REDIS_URL set, values live in Redis as JSON under
+    redis_key so every worker shares one copy and sees invalidations immediately; otherwise this
+    falls back to the per-process cache under key.
+    """
+    if async_redis_client is None:
+        return await get_or_load_async(cache, key, loader)
+    cached = await async_redis_client.get(redis_key)
+    if cached is not None:
+        return adapter.validate_json(cached)
+    value = await loader()
+    await async_redis_client.set(redis_key, adapter.dump_json(value), ex=SHARED_CACHE_TTL)
+    return value
+
+def get_or_load_shared_sync(cache: TTLCache, key, redis_key: str, adapter: TypeAdapter, loader):
+    """
+    get_or_load_shared for sync callers: uses the blocking Redis client and a plain loader().
+    """
+    if redis_client is None:
+        return get_or_load(cache, key, loader)
+    cached = redis_client.get(redis_key)
+    if cached is not None:
+        return adapter.validate_json(cached)
+    value = loader()
+    redis_client.set(redis_key, adapter.dump_json(value), ex=SHARED_CACHE_TTL)
+    return value
+
+def invalidate_shared(cache: TTLCache, key, redis_key: str) -> None:
+    invalidate(cache, key)
+    if redis_client is not None:
+        redis_client.delete(redis_key)
+
+async def invalidate_shared_async(cache: TTLCache, key, redis_key: str) -> None:
+    invalidate(cache, key)
+    if async_redis_client is not None:
+        await async_redis_client.delete(redis_key)
+
+def leave_balance_key(user_id: int) -> str:
+    return f"leave:balance:{user_id}"
+
+def overtime_leave_key(user_id: int, year: int) -> str:
+    return f"leave:ot:{user_id}:{year}"
+
+def team_key(manager_id: int) -> str:
+    return f"team:{manager_id}"
+
+def peek(cache: TTLCache, key):
+    with _lock:
+        return cache.get(key)
+
+def store(cache: TTLCache, key, value) -> None:
+    with _lock:
+        cache[key] = value
+
+def invalidate(cache: TTLCache, key) -> None:
+    with _lock:
+        cache.pop(key, None)
+
+def clear(cache: TTLCache) -> None:
+    with _lock:
+        cache.clear()
@@ -1,18 +1,97 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
+import csv
+import io
+import uuid
+from functools import lru_cache
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool
+from config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_PGBOUNCER
 
 
 print("DATABASE_URL : ",DATABASE_URL)
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Pool sized for the threadpool fan-out of one worker (DB_POOL_SIZE/DB_MAX_OVERFLOW); pre_ping and
+# recycle drop connections the server or a proxy has closed before a request picks them up.
+# engine.pool.status() reports checked-out vs. idle connections when sizing these.
+POOL_OPTIONS = dict(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=30, pool_pre_ping=True, pool_recycle=1800)
+
+# values_plus_batch also pages executemany UPDATE/DELETE through psycopg2's execute_batch
+engine = create_engine(DATABASE_URL, executemany_mode="values_plus_batch", **POOL_OPTIONS)
+# Keep loaded attributes after commit so returning an object doesn't re-SELECT it
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Async engine on the same database through asyncpg, for endpoints that await their queries
+ASYNC_DATABASE_URL = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+if DB_PGBOUNCER:
+    # PgBouncer in transaction mode pools the server connections and may hand each transaction a
+    # different one, so asyncpg must not reuse statements it prepared on an earlier backend
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=NullPool,
+        connect_args={
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        },
+    )
+else:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **POOL_OPTIONS)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
+@lru_cache(maxsize=1)
+def ensure_schema():
+    """
+    Create any missing tables. Runs at most once per process and checks
+    existing tables with a single catalog query instead of one per table.
+    """
+    with engine.begin() as conn:
+        existing_tables = set(inspect(conn).get_table_names())
+        missing_tables = [table for table in Base.metadata.sorted_tables if table.name not in existing_tables]
+        if missing_tables:
+            Base.metadata.create_all(bind=conn, tables=missing_tables)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def release_connection(db) -> None:
+    """
+    Hand a read-only handler's connection back to the pool once its rows are fully loaded.
+    Dependency teardown only runs after the response has been sent, so without this the
+    connection stays checked out while the rows are encoded and written to the client.
+    Already-loaded objects stay readable; the session reconnects if it is used again.
+    """
+    await db.close()
+
+def copy_mappings(db, model, rows):
+    """
+    Bulk-load a list of dicts into model's table with PostgreSQL COPY.
+    Runs on the session's own connection so the rows are part of its current transaction.
+    """
+    if not rows:
+        return
+    columns = list(rows[0].keys())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[column] for column in columns])
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {model.__table__.name} ({', '.join(columns)}) FROM STDIN WITH CSV",
+            buffer
+        )
+    finally:
+        cursor.close()
@@ -1,3 +1,4 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from database import engine
 import models
@@ -7,10 +8,10 @@ def db_reset_for_demo():
     session = Session(bind=engine)
     try:
         # Delete OvertimeLeave (depends on OvertimeRequest)
-        session.query(models.OvertimeLeave).delete()
+        session.query(models.OvertimeLeave).delete(synchronize_session=False)
 
         # Delete OvertimeRequest
-        session.query(models.OvertimeRequest).delete()
+        session.query(models.OvertimeRequest).delete(synchronize_session=False)
 
         # Delete Attachments for BankLetterRequest and VisaLetterRequest
         session.query(models.Attachment).filter(
@@ -19,19 +20,21 @@ def db_reset_for_demo():
         ).delete(synchronize_session=False)
 
         # Delete BankLetterRequest
-        session.query(models.BankLetterRequest).delete()
+        session.query(models.BankLetterRequest).delete(synchronize_session=False)
 
         # Delete VisaLetterRequest
-        session.query(models.VisaLetterRequest).delete()
+        session.query(models.VisaLetterRequest).delete(synchronize_session=False)
 
         # Delete LeaveRequest
-        session.query(models.LeaveRequest).delete()
+        session.query(models.LeaveRequest).delete(synchronize_session=False)
 
         # Reset LeaveBalance: used_days=0, remaining_days=total_days
-        leave_balances = session.query(models.LeaveBalance).all()
-        for lb in leave_balances:
-            lb.used_days = 0
-            lb.remaining_days = lb.total_days
+        session.execute(
+            update(models.LeaveBalance).values(
+                used_days=0,
+                remaining_days=models.LeaveBalance.total_days
+            )
+        )
         session.commit()
         print("data reset successfully.")
     except Exception as e:
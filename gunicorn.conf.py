@@ -0,0 +1,20 @@
+import multiprocessing
+import os
+
+# Production entrypoint: gunicorn main:app -c gunicorn.conf.py
+# Each worker is a separate process with its own event loop and its own database pools,
+# so total connections are roughly workers * 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW). The default
+# worker count is capped so that product stays within DB_MAX_CONNECTIONS (see README).
+bind = os.getenv("BIND", "0.0.0.0:8181")
+_connections_per_worker = 2 * (int(os.getenv("DB_POOL_SIZE", "20")) + int(os.getenv("DB_MAX_OVERFLOW", "10")))
+_connection_budget = int(os.getenv("DB_MAX_CONNECTIONS", "100"))
+workers = int(os.getenv(
+    "WEB_CONCURRENCY",
+    max(1, min(multiprocessing.cpu_count() * 2 + 1, _connection_budget // _connections_per_worker)),
+))
+# uvicorn[standard] installs uvloop and httptools, which UvicornWorker picks up automatically
+worker_class = "uvicorn.workers.UvicornWorker"
+worker_connections = 1000
+keepalive = 5
+timeout = 60
+graceful_timeout = 30
@@ -0,0 +1,73 @@
+import re
+from hashlib import blake2b
+from starlette.datastructures import Headers, MutableHeaders
+
+# Idempotent GETs that clients poll. Matched against the path without the app's root_path.
+CACHEABLE_GET_PATHS = (
+    r"/leave/balance",
+    r"/leave/entitled/overtime",
+    r"/leave/get_eligible_leaves",
+    r"/bank-letter/\d+",
+)
+CACHE_MAX_AGE_SECONDS = 30
+
+class ETagMiddleware:
+    """
+    Adds a strong ETag (hash of the response body) and a short private Cache-Control to
+    successful GETs on the configured paths, and answers 304 Not Modified when the client's
+    If-None-Match already names that ETag, so unchanged payloads are not sent again.
+    """
+
+    def __init__(self, app, paths=CACHEABLE_GET_PATHS, max_age: int = CACHE_MAX_AGE_SECONDS):
+        self.app = app
+        self.paths = re.compile("|".join(f"(?:{path})" for path in paths))
+        self.cache_control = f"private, max-age={max_age}"
+
+    def _is_cacheable(self, scope) -> bool:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return False
+        path, root_path = scope["path"], scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        return self.paths.fullmatch(path) is not None
+
+    async def __call__(self, scope, receive, send):
+        if not self._is_cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        body = []
+
+        async def send_with_etag(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            content = b"".join(body)
+            if start["status"] != 200:
+                await send(start)
+                await send({"type": "http.response.body", "body": content})
+                return
+
+            etag = f'"{blake2b(content, digest_size=16).hexdigest()}"'
+            headers = MutableHeaders(raw=start["headers"])
+            headers["ETag"] = etag
+            headers["Cache-Control"] = self.cache_control
+            # Responses are per user; shared caches must key on the bearer token
+            headers.add_vary_header("Authorization")
+
+            if_none_match = Headers(scope=scope).get("if-none-match", "")
+            if etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+                del headers["Content-Length"]
+                del headers["Content-Type"]
+                await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": content})
+
+        await self.app(scope, receive, send_with_etag)
@@ -4,17 +4,30 @@ Database initialization script for Noah HR Management API
 Creates sample users and leave balances for demo purposes.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
-from database import SessionLocal, engine
+from database import SessionLocal, ensure_schema, copy_mappings
 import models
 from auth import get_password_hash
 
+def hash_passwords(passwords):
+    """Hash each distinct password once, spreading the bcrypt work across processes"""
+    unique_passwords = list(dict.fromkeys(passwords))
+    if len(unique_passwords) == 1:
+        return {unique_passwords[0]: get_password_hash(unique_passwords[0])}
+    
+    max_workers = min(len(unique_passwords), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(unique_passwords, executor.map(get_password_hash, unique_passwords)))
+
 def init_database():
     """Initialize database with sample data"""
     
     # Create all tables
-    models.Base.metadata.create_all(bind=engine)
+    ensure_schema()
     
     # Create a database session
     db = SessionLocal()
@@ -36,7 +49,7 @@ def init_database():
                 "department": "Engineering",
                 "position": "Solutions Engineer",
                 "password": "Optio#2024"
-            }
+            },
             {
                 "username": "jane_smith",
                 "email": "jane.smith@noah.com",
@@ -67,31 +80,35 @@ def init_database():
             }
         ]
         
-        created_users = []
-        
-        # Create users
+        # Create users in a single INSERT ... RETURNING
+        password_hashes = hash_passwords(user_data["password"] for user_data in sample_users)
+        user_rows = []
         for user_data in sample_users:
             password = user_data.pop("password")
-            hashed_password = get_password_hash(password)
-            
-            user = models.User(
-                **user_data,
-                hashed_password=hashed_password
-            )
-            
-            db.add(user)
-            db.flush()  # Flush to get the ID
-            created_users.append(user)
+            user_data.setdefault("manager_id", None)
+            user_data["hashed_password"] = password_hashes[password]
+            user_rows.append(user_data)
+        
+        user_ids = db.scalars(
+            insert(models.User).returning(models.User.id, sort_by_parameter_order=True),
+            user_rows
+        ).all()
         
         # Set manager relationships
-        created_users[0].manager_id = created_users[2].id  # John reports to Mike
-        created_users[3].manager_id = created_users[2].id  # Sarah reports to Mike
+        db.execute(
+            update(models.User),
+            [
+                {"id": user_ids[0], "manager_id": user_ids[2]},  # John reports to Mike
+                {"id": user_ids[3], "manager_id": user_ids[2]},  # Sarah reports to Mike
+            ]
+        )
         
         # Create leave balances for all users
         leave_types = ["Annual", "Sick", "Personal"]
         current_year = datetime.now().year
         
-        for user in created_users:
+        leave_balance_rows = []
+        for user_id in user_ids:
             for leave_type in leave_types:
                 if leave_type == "Annual":
                     total_days = 25.0
@@ -100,23 +117,23 @@ def init_database():
                 else:  # Personal
                     total_days = 5.0
                 
-                leave_balance = models.LeaveBalance(
-                    user_id=user.id,
-                    leave_type=leave_type,
-                    total_days=total_days,
-                    used_days=0.0,
-                    remaining_days=total_days,
-                    year=current_year
-                )
-                db.add(leave_balance)
+                leave_balance_rows.append({
+                    "user_id": user_id,
+                    "leave_type": leave_type,
+                    "total_days": total_days,
+                    "used_days": 0.0,
+                    "remaining_days": total_days,
+                    "year": current_year
+                })
+        copy_mappings(db, models.LeaveBalance, leave_balance_rows)
         
         # Commit all changes
         db.commit()
         
         print("Database initialized successfully!")
         print("\nSample users created:")
-        for user in created_users:
-            print(f"- {user.username} ({user.full_name}) - {user.department}")
+        for user in user_rows:
+            print(f"- {user['username']} ({user['full_name']}) - {user['department']}")
         
         print("\nDefault password for all users: password123")
         print("\nLeave balances created:")
@@ -1,8 +1,8 @@
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from database import SessionLocal, copy_mappings
 from models import Course, Enrollment, Completion, User
 from datetime import datetime, timedelta
-import random
+import numpy as np
 
 def init_lms_data():
     db = SessionLocal()
@@ -52,60 +52,72 @@ def init_lms_data():
         ]
         
         # Add courses to database
-        for course in courses:
-            db.add(course)
-        db.commit()
+        db.bulk_save_objects(courses)
         
         # Get all courses and users
         courses = db.query(Course).all()
         users = db.query(User).all()
         
+        rng = np.random.default_rng()
+        
         # Create sample enrollments
         enrollment_statuses = ['active', 'completed', 'dropped']
-        for user in users:
-            # Each user enrolls in 2-3 random courses
-            num_enrollments = random.randint(2, 3)
-            selected_courses = random.sample(courses, num_enrollments)
-            
-            for course in selected_courses:
-                # Random enrollment date within last 6 months
-                enrollment_date = datetime.utcnow() - timedelta(days=random.randint(0, 180))
-                
-                enrollment = Enrollment(
-                    user_id=user.id,
-                    course_id=course.course_id,
-                    enrolled_at=enrollment_date,
-                    status=random.choice(enrollment_statuses),
-                    progress=random.randint(0, 100)
-                )
-                db.add(enrollment)
+        # Each user enrolls in 2-3 distinct random courses
+        enrollments_per_user = rng.integers(2, 4, size=len(users))
+        course_order = rng.random((len(users), len(courses))).argsort(axis=1)
+        enrollment_pairs = [
+            (user.id, courses[course_index].course_id)
+            for user, num_enrollments, user_course_order in zip(users, enrollments_per_user.tolist(), course_order.tolist())
+            for course_index in user_course_order[:num_enrollments]
+        ]
+        # Random enrollment date within last 6 months
+        enrollment_days = rng.integers(0, 181, size=len(enrollment_pairs))
+        status_idx = rng.integers(0, len(enrollment_statuses), size=len(enrollment_pairs))
+        progress = rng.integers(0, 101, size=len(enrollment_pairs))
         
-        db.commit()
+        now = datetime.utcnow()
+        enrollment_rows = []
+        for (user_id, course_id), days_ago, status_i, enrollment_progress in zip(
+            enrollment_pairs, enrollment_days.tolist(), status_idx.tolist(), progress.tolist()
+        ):
+            enrollment_rows.append({
+                "user_id": user_id,
+                "course_id": course_id,
+                "enrolled_at": now - timedelta(days=days_ago),
+                "status": enrollment_statuses[status_i],
+                "progress": enrollment_progress
+            })
+        
+        copy_mappings(db, Enrollment, enrollment_rows)
         
         # Create sample completions
-        for user in users:
-            # Get user's completed enrollments
-            completed_enrollments = db.query(Enrollment).filter(
-                Enrollment.user_id == user.id,
-                Enrollment.status == 'completed'
-            ).all()
-            
-            for enrollment in completed_enrollments:
-                # Check if completion record already exists
-                existing_completion = db.query(Completion).filter(
-                    Completion.user_id == user.id,
-                    Completion.course_id == enrollment.course_id
-                ).first()
-                
-                if not existing_completion:
-                    completion = Completion(
-                        user_id=user.id,
-                        course_id=enrollment.course_id,
-                        completed_at=enrollment.enrolled_at + timedelta(days=random.randint(30, 90)),
-                        certificate_url=f"https://example.com/certificates/{user.id}_{enrollment.course_id}.pdf"
-                    )
-                    db.add(completion)
+        # Load completed enrollments and existing completions once instead of per user/enrollment
+        completed_enrollments = db.query(Enrollment).filter(
+            Enrollment.status == 'completed'
+        ).all()
+        existing_completions = {
+            (user_id, course_id)
+            for user_id, course_id in db.query(Completion.user_id, Completion.course_id).all()
+        }
+        
+        completion_days = rng.integers(30, 91, size=len(completed_enrollments))
+        
+        completions = []
+        for enrollment, days_to_complete in zip(completed_enrollments, completion_days.tolist()):
+            key = (enrollment.user_id, enrollment.course_id)
+            if key not in existing_completions:
+                existing_completions.add(key)
+                completion = Completion(
+                    user_id=enrollment.user_id,
+                    course_id=enrollment.course_id,
+                    completed_at=enrollment.enrolled_at + timedelta(days=days_to_complete),
+                    certificate_url=f"https://example.com/certificates/{enrollment.user_id}_{enrollment.course_id}.pdf"
+                )
+                completions.append(completion)
+        
+        db.bulk_save_objects(completions)
         
+        # Courses, enrollments and completions are committed together
         db.commit()
         print("Successfully initialized LMS data")
         
@@ -6,15 +6,15 @@ Creates sample overtime requests for existing users.
 
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from database import SessionLocal, engine
+from database import SessionLocal, ensure_schema, copy_mappings
 import models
-import random
+import numpy as np
 
 def init_overtime_requests():
     """Initialize database with sample overtime request data"""
     
     # Create the overtime_requests table if it doesn't exist
-    models.Base.metadata.create_all(bind=engine)
+    ensure_schema()
     
     # Create a database session
     db = SessionLocal()
@@ -44,43 +44,44 @@ def init_overtime_requests():
             "Team building"
         ]
         
+        # Status and approver comment, picked by thresholds on a uniform roll
+        statuses = [
+            ("pending", None),
+            ("approved", "Approved for project completion"),
+            ("rejected", "Not enough justification for overtime")
+        ]
+        
         # Create sample overtime requests for the last 3 months
         current_date = datetime.now()
+        rng = np.random.default_rng()
+        
+        # Draw all random values up front: 2-4 requests per user
+        requests_per_user = rng.integers(2, 5, size=len(users))
+        user_ids = np.repeat([user.id for user in users], requests_per_user)
+        total_requests = len(user_ids)
+        # Random date within last 3 months
+        random_days = rng.integers(0, 91, size=total_requests)
+        # Random hours between 1 and 8
+        hours = rng.integers(1, 9, size=total_requests)
+        # Random status (70% pending, 20% approved, 10% rejected)
+        status_idx = np.searchsorted([0.7, 0.9], rng.random(total_requests), side="right")
+        reason_idx = rng.integers(0, len(reasons), size=total_requests)
+        
+        overtime_rows = []
+        for user_id, days_ago, request_hours, status_i, reason_i in zip(
+            user_ids.tolist(), random_days.tolist(), hours.tolist(), status_idx.tolist(), reason_idx.tolist()
+        ):
+            status, approver_comments = statuses[status_i]
+            overtime_rows.append({
+                "user_id": user_id,
+                "date": (current_date - timedelta(days=days_ago)).date(),
+                "hours": request_hours,
+                "reason": reasons[reason_i],
+                "status": status,
+                "approver_comments": approver_comments
+            })
         
-        for user in users:
-            # Create 2-4 random overtime requests per user
-            num_requests = random.randint(2, 4)
-            
-            for _ in range(num_requests):
-                # Random date within last 3 months
-                random_days = random.randint(0, 90)
-                request_date = current_date - timedelta(days=random_days)
-                
-                # Random hours between 1 and 8
-                hours = random.randint(1, 8)
-                
-                # Random status (70% pending, 20% approved, 10% rejected)
-                status_roll = random.random()
-                if status_roll < 0.7:
-                    status = "pending"
-                    manager_comments = None
-                elif status_roll < 0.9:
-                    status = "approved"
-                    manager_comments = "Approved for project completion"
-                else:
-                    status = "rejected"
-                    manager_comments = "Not enough justification for overtime"
-                
-                overtime_request = models.OvertimeRequest(
-                    user_id=user.id,
-                    date=request_date.date(),
-                    hours=hours,
-                    reason=random.choice(reasons),
-                    status=status,
-                    manager_comments=manager_comments
-                )
-                
-                db.add(overtime_request)
+        copy_mappings(db, models.OvertimeRequest, overtime_rows)
         
         # Commit all changes
         db.commit()
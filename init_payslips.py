@@ -6,14 +6,14 @@ Creates sample payslips for existing users.
 
 from datetime import datetime
 from sqlalchemy.orm import Session
-from database import SessionLocal, engine
+from database import SessionLocal, ensure_schema, copy_mappings
 import models
 
 def init_payslips():
     """Initialize database with sample payslip data"""
     
     # Create the payslips table if it doesn't exist
-    models.Base.metadata.create_all(bind=engine)
+    ensure_schema()
     
     # Create a database session
     db = SessionLocal()
@@ -46,37 +46,39 @@ def init_payslips():
             "default": {"basic": 4000.0, "allowances": 800.0}
         }
         
+        # (month, year) for the current and previous two months, newest first
+        periods = [
+            ((current_month - i - 1) % 12 + 1, current_year - (i >= current_month))
+            for i in range(3)
+        ]
+        
         # Create payslips for each user for the last 3 months
+        payslip_rows = []
         for user in users:
             # Get salary config based on position, use default if position not found
             salary_config = salary_configs.get(user.position, salary_configs["default"])
             basic_salary = salary_config["basic"]
             allowances = salary_config["allowances"]
             
-            for i in range(3):
-                month = current_month - i
-                year = current_year
-                
-                if month <= 0:
-                    month += 12
-                    year -= 1
-                
-                # Calculate deductions (example: 10% of basic salary)
-                deductions = basic_salary * 0.1
-                net_salary = basic_salary + allowances - deductions
-                
-                # Create payslip
-                payslip = models.Payslip(
-                    user_id=user.id,
-                    month=month,
-                    year=year,
-                    basic_salary=basic_salary,
-                    allowances=allowances,
-                    deductions=deductions,
-                    net_salary=net_salary,
-                    status="approved" if i > 0 else "pending"  # Older payslips are approved
-                )
-                db.add(payslip)
+            # Calculate deductions (example: 10% of basic salary)
+            deductions = basic_salary * 0.1
+            net_salary = basic_salary + allowances - deductions
+            
+            payslip_rows.extend(
+                {
+                    "user_id": user.id,
+                    "month": month,
+                    "year": year,
+                    "basic_salary": basic_salary,
+                    "allowances": allowances,
+                    "deductions": deductions,
+                    "net_salary": net_salary,
+                    "status": "approved" if i > 0 else "pending"  # Older payslips are approved
+                }
+                for i, (month, year) in enumerate(periods)
+            )
+        
+        copy_mappings(db, models.Payslip, payslip_rows)
         
         # Commit all changes
         db.commit()
@@ -6,7 +6,7 @@ Creates tables and adds sample data for existing users.
 
 from datetime import datetime
 from sqlalchemy.orm import Session
-from database import SessionLocal, engine
+from database import SessionLocal, ensure_schema
 import models
 from auth import get_current_active_user
 
@@ -15,7 +15,7 @@ def init_salary_benefits():
     
     print("Creating salary and benefits tables...")
     # Create tables
-    models.Base.metadata.create_all(bind=engine)
+    ensure_schema()
     print("Tables created successfully!")
     
     # Create a database session
@@ -62,25 +62,26 @@ def init_salary_benefits():
             }
         ]
         
-        created_benefits = []
-        for benefit_data in sample_benefits:
-            benefit = models.Benefit(**benefit_data)
-            db.add(benefit)
-            db.flush()
-            created_benefits.append(benefit)
+        # A single flush inserts all benefits and returns their IDs
+        created_benefits = [models.Benefit(**benefit_data) for benefit_data in sample_benefits]
+        db.add_all(created_benefits)
+        db.flush()
+        
+        now = datetime.now()
         
         # Get all existing users
         existing_users = db.query(models.User).all()
         print(f"\nFound {len(existing_users)} existing users")
         
+        # Users that already have a salary structure, loaded in one query
+        users_with_salary = {
+            user_id for (user_id,) in db.query(models.SalaryStructure.user_id).all()
+        }
+        
         # Create sample salary structures for existing users
+        new_rows = []
         for user in existing_users:
-            # Check if user already has a salary structure
-            existing_salary = db.query(models.SalaryStructure).filter(
-                models.SalaryStructure.user_id == user.id
-            ).first()
-            
-            if not existing_salary:
+            if user.id not in users_with_salary:
                 salary_structure = models.SalaryStructure(
                     user_id=user.id,
                     basic_salary=5000.0,
@@ -93,9 +94,9 @@ def init_salary_benefits():
                         "Tax": 500.0,
                         "PF": 600.0
                     },
-                    effective_date=datetime.now()
+                    effective_date=now
                 )
-                db.add(salary_structure)
+                new_rows.append(salary_structure)
         
         # Create sample benefit enrollments
         for user in existing_users:
@@ -104,20 +105,22 @@ def init_salary_benefits():
                 user_id=user.id,
                 benefit_id=created_benefits[0].benefit_id,  # Health Insurance
                 enrollment_status="approved",
-                enrollment_date=datetime.now(),
+                enrollment_date=now,
                 approved_by=user.id,  # Self-approved for sample data
-                approved_at=datetime.now()
+                approved_at=now
             )
-            db.add(enrollment)
+            new_rows.append(enrollment)
             
             # Enroll in gym membership (pending)
             enrollment = models.BenefitEnrollment(
                 user_id=user.id,
                 benefit_id=created_benefits[3].benefit_id,  # Gym Membership
                 enrollment_status="pending",
-                enrollment_date=datetime.now()
+                enrollment_date=now
             )
-            db.add(enrollment)
+            new_rows.append(enrollment)
+        
+        db.bulk_save_objects(new_rows)
         
         # Commit all changes
         db.commit()
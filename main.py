@@ -1,14 +1,31 @@
+import time
+from contextlib import asynccontextmanager
+import anyio
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from database import engine, get_db
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import async_engine, get_async_db
+from config import ENABLE_DOCS, CORS_ORIGINS, DB_POOL_SIZE, DB_MAX_OVERFLOW
+from http_cache import ETagMiddleware
 import models
 from routers import auth, users, leave, bank_letter, visa_letter, requests, payslips, salary_benefits, pms, lms, overtime
 from sqlalchemy import text
 from fastapi.staticfiles import StaticFiles
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Sync endpoints run on anyio's worker threads and each holds a pooled connection while it runs.
+# Matching the thread count to the sync pool's capacity makes excess requests queue for a thread
+# instead of blocking a thread on pool_timeout and failing with "QueuePool limit ... reached".
+THREADPOOL_SIZE = DB_POOL_SIZE + DB_MAX_OVERFLOW
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema changes are applied out-of-band with `alembic upgrade head`
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    # Build the OpenAPI schema now rather than on the first /docs or /openapi.json hit
+    app.openapi()
+    yield
+    await async_engine.dispose()
 
 # Create FastAPI app with custom documentation
 app = FastAPI(
@@ -79,17 +96,28 @@ app = FastAPI(
         "name": "MIT",
     },
     root_path="/erp",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    # Set ENABLE_DOCS=false in production to turn off Swagger UI and ReDoc
+    docs_url="/docs" if ENABLE_DOCS else None,
+    redoc_url="/redoc" if ENABLE_DOCS else None,
          # ReDoc endpoint (optional)
 ) 
 
 
+# ETag / Cache-Control on polled GETs (see http_cache.CACHEABLE_GET_PATHS); added before CORS so CORS stays outermost
+app.add_middleware(ETagMiddleware)
+
 # Add CORS middleware
+# Set CORS_ORIGINS to a comma-separated list of frontend origins in production
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    expose_headers=["X-Next-Cursor", "ETag"],
+    max_age=86400,  # Let browsers reuse a preflight result for a day
 )
 
 # Include routers
@@ -121,20 +149,31 @@ async def root():
         "status": "healthy"
     }
 
+# A successful database check is reused for this many seconds; failures are never cached
+HEALTH_CACHE_SECONDS = 5
+_last_ok_ts = None
+_last_result = None
+
 @app.get("/health", tags=["Health"])
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """
     Health check endpoint to verify API and database connectivity.
     """
+    global _last_ok_ts, _last_result
+    if _last_ok_ts is not None and time.monotonic() - _last_ok_ts < HEALTH_CACHE_SECONDS:
+        return _last_result
     try:
         # Simple database query to check connection
-        db.execute(text("SELECT 1"))
-        return {
+        await db.execute(text("SELECT 1"))
+        _last_result = {
             "status": "healthy",
             "database": "connected",
             "message": "All systems operational"
         }
+        _last_ok_ts = time.monotonic()
+        return _last_result
     except Exception as e:
+        _last_ok_ts = None
         return {
             "status": "unhealthy",
             "database": "disconnected",
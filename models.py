@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, UniqueConstraint, JSON, Date, BigInteger
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, UniqueConstraint, CheckConstraint, JSON, Date, BigInteger, Index, LargeBinary, type_coerce
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.sql import func, text
+from sqlalchemy.ext.hybrid import hybrid_property
 from database import Base
 from enum import Enum as PyEnum
 from sqlalchemy import Enum as SqlEnum
@@ -12,6 +13,18 @@ class DepartmentEnum(PyEnum):
     MARKETING = "MARKETING"
     FINANCE = "FINANCE"
 
+class RequestStatus(str, PyEnum):
+    pending = "pending"
+    approved = "approved"
+    rejected = "rejected"
+    completed = "completed"
+
+    def __str__(self):
+        return self.value
+
+# One native enum type shared by every approval-workflow status column
+request_status_enum = SqlEnum(RequestStatus, name="request_status")
+
 class User(Base):
     __tablename__ = "users"
     
@@ -24,7 +37,7 @@ class User(Base):
     employee_id = Column(String, unique=True, nullable=False)
     department = Column(SqlEnum(DepartmentEnum), nullable=False)
     position = Column(String, nullable=False)
-    manager_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    manager_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     grade = Column(String(100))
     doj = Column(DateTime)
@@ -37,36 +50,53 @@ class User(Base):
     sbu = Column(String(100), nullable=True, default='General')
     religion = Column(String(100), nullable=False, default='Not Specified')
 
+    __table_args__ = (
+        # Covering index so the login lookup is an index-only scan
+        Index('ix_users_email_login', 'email', postgresql_include=['hashed_password', 'is_active', 'id', 'username']),
+    )
+    # Models with server defaults or onupdate columns set eager_defaults: the flush fetches them
+    # with RETURNING, so writes need no refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
     
     # Essential relationships
-    leave_requests = relationship("LeaveRequest", back_populates="user", cascade="all, delete-orphan")
-    bank_letter_requests = relationship("BankLetterRequest", back_populates="user", cascade="all, delete-orphan")
-    visa_letter_requests = relationship("VisaLetterRequest", back_populates="user", cascade="all, delete-orphan")
-    payslips = relationship("Payslip", back_populates="user", foreign_keys="Payslip.user_id", cascade="all, delete-orphan")
-    salary_structure = relationship("SalaryStructure", back_populates="user", foreign_keys="SalaryStructure.user_id", uselist=False, cascade="all, delete-orphan")
-    benefit_enrollments = relationship("BenefitEnrollment", back_populates="user", foreign_keys="BenefitEnrollment.user_id", cascade="all, delete-orphan")
-    
-    performance_goals = relationship("PerformanceGoal", back_populates="user", foreign_keys="PerformanceGoal.user_id", cascade="all, delete-orphan")
-    performance_reviews = relationship("PerformanceReview", back_populates="user", foreign_keys="PerformanceReview.user_id", cascade="all, delete-orphan")
-    overtime_requests = relationship("OvertimeRequest", back_populates="user", cascade="all, delete-orphan")
-    leave_balances = relationship("LeaveBalance", cascade="all, delete-orphan", back_populates="user")
+    leave_requests = relationship("LeaveRequest", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    bank_letter_requests = relationship("BankLetterRequest", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    visa_letter_requests = relationship("VisaLetterRequest", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    payslips = relationship("Payslip", back_populates="user", foreign_keys="Payslip.user_id", cascade="all, delete-orphan", passive_deletes=True)
+    salary_structure = relationship("SalaryStructure", back_populates="user", foreign_keys="SalaryStructure.user_id", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    benefit_enrollments = relationship("BenefitEnrollment", back_populates="user", foreign_keys="BenefitEnrollment.user_id", cascade="all, delete-orphan", passive_deletes=True)
+    
+    performance_goals = relationship("PerformanceGoal", back_populates="user", foreign_keys="PerformanceGoal.user_id", cascade="all, delete-orphan", passive_deletes=True)
+    performance_reviews = relationship("PerformanceReview", back_populates="user", foreign_keys="PerformanceReview.user_id", cascade="all, delete-orphan", passive_deletes=True)
+    overtime_requests = relationship("OvertimeRequest", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    leave_balances = relationship("LeaveBalance", cascade="all, delete-orphan", passive_deletes=True, back_populates="user")
 
 class LeaveRequest(Base):
     __tablename__ = "leave_requests"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     # Allowed values: 'Annual', 'Sick', 'Casual'
     leave_type = Column(String, nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     days_requested = Column(Float, nullable=False)
     reason = Column(Text, nullable=False)
-    status = Column(String, default="pending")  # pending, approved, rejected
+    status = Column(request_status_enum, default=RequestStatus.pending, index=True)  # pending, approved, rejected
     approver_comments = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index('ix_leave_user_status_created', 'user_id', 'status', 'created_at'),
+        Index('ix_leave_created_id', 'created_at', 'id'),
+        Index('ix_leave_pending', 'user_id', 'created_at', postgresql_where=text("status = 'pending'")),
+        # Overlap checks only consider live requests, so rejected rows stay out of the index
+        Index('ix_lr_user_status_dates', 'user_id', 'status', 'start_date', 'end_date',
+              postgresql_where=text("status IN ('pending', 'approved')")),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Relationships
     user = relationship("User", back_populates="leave_requests")
 
@@ -82,6 +112,12 @@ class LeaveBalance(Base):
     remaining_days = Column(Float, nullable=False)
     year = Column(Integer, nullable=False)
     
+    __table_args__ = (
+        Index('ix_leave_balance_user_type_year', 'user_id', 'leave_type', 'year'),
+        # Backstop for the guarded deduction in update_leave_balance
+        CheckConstraint('remaining_days >= 0', name='ck_leave_balance_remaining_nonnegative'),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="leave_balances")
 
@@ -92,58 +128,73 @@ class Attachment(Base):
     file_name = Column(String, nullable=False)
     file_type = Column(String, nullable=False)
     file_desc = Column(String, nullable=True)
-    file_data = Column(Text, nullable=False)  # Base64 encoded file data
-    bank_letter_request_id = Column(Integer, ForeignKey("bank_letter_requests.id"), nullable=True)
-    visa_letter_request_id = Column(Integer, ForeignKey("visa_letter_requests.id"), nullable=True)
+    # Raw file bytes, base64 only at the API boundary; deferred so listings don't pull the blobs
+    file_data = deferred(Column(LargeBinary, nullable=False))
+    bank_letter_request_id = Column(Integer, ForeignKey("bank_letter_requests.id", ondelete="SET NULL"), nullable=True)
+    visa_letter_request_id = Column(Integer, ForeignKey("visa_letter_requests.id", ondelete="SET NULL"), nullable=True)
 
 class BankLetterRequest(Base):
     __tablename__ = "bank_letter_requests"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     bank_name = Column(String, nullable=False)
     type = Column(String, nullable=False)
     comment = Column(Text, nullable=True)
-    status = Column(String, default="pending")  # pending, approved, rejected, completed
+    status = Column(request_status_enum, default=RequestStatus.pending, index=True)  # pending, approved, rejected, completed
     approver_comments = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index('ix_bank_letter_user_status_created', 'user_id', 'status', 'created_at'),
+        Index('ix_bank_letter_pending', 'user_id', 'created_at', postgresql_where=text("status = 'pending'")),
+        Index('ix_bank_letter_created_id', 'created_at', 'id'),
+    )
+    # Fetch server-generated created_at/updated_at with RETURNING on flush rather than expiring them
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Relationships
     user = relationship("User", back_populates="bank_letter_requests")
-    attachments = relationship("Attachment", foreign_keys=[Attachment.bank_letter_request_id])
+    attachments = relationship("Attachment", foreign_keys=[Attachment.bank_letter_request_id], lazy="selectin")
 
 class VisaLetterRequest(Base):
     __tablename__ = "visa_letter_requests"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     type = Column(String, nullable=False)  # employment letter, salary certificate, etc.
     comment = Column(Text, nullable=True)
     language = Column(String, nullable=False, default="English")
     addressed_to = Column(String, nullable=False)
     country = Column(String, nullable=False)
-    status = Column(String, default="pending")  # pending, approved, rejected, completed
+    status = Column(request_status_enum, default=RequestStatus.pending, index=True)  # pending, approved, rejected, completed
     approver_comments = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index('ix_visa_letter_user_status_created', 'user_id', 'status', 'created_at'),
+        Index('ix_visa_letter_pending', 'user_id', 'created_at', postgresql_where=text("status = 'pending'")),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Relationships
     user = relationship("User", back_populates="visa_letter_requests")
-    attachments = relationship("Attachment", foreign_keys=[Attachment.visa_letter_request_id]) 
+    attachments = relationship("Attachment", foreign_keys=[Attachment.visa_letter_request_id], lazy="selectin") 
 
 class Payslip(Base):
     __tablename__ = "payslips"
     
     payslip_id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     month = Column(Integer, nullable=False)  # 1-12
     year = Column(Integer, nullable=False)
     basic_salary = Column(Float, nullable=False)
     allowances = Column(Float, default=0.0)
     deductions = Column(Float, default=0.0)
     net_salary = Column(Float, nullable=False)
-    status = Column(String, default="pending")  # pending, approved, rejected
+    status = Column(request_status_enum, default=RequestStatus.pending)  # pending, approved, rejected
     approved_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     approved_at = Column(DateTime(timezone=True), nullable=True)
     approver_comments = Column(Text, nullable=True)
@@ -152,18 +203,19 @@ class Payslip(Base):
     
     __table_args__ = (
         UniqueConstraint('user_id', 'month', 'year', name='uix_user_month_year'),
+        Index('ix_payslip_pending', 'user_id', 'created_at', postgresql_where=text("status = 'pending'")),
     )
+    __mapper_args__ = {"eager_defaults": True}
     
     # Essential relationships for payslip functionality
     user = relationship("User", foreign_keys=[user_id], back_populates="payslips")
     approver = relationship("User", foreign_keys=[approved_by])
-User.payslips = relationship("Payslip", back_populates="user", foreign_keys=[Payslip.user_id]) 
 
 class SalaryStructure(Base):
     __tablename__ = "salary_structures"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     basic_salary = Column(Float, nullable=False)
     allowances = Column(JSON, nullable=False, default={})
     deductions = Column(JSON, nullable=False, default={})
@@ -184,14 +236,15 @@ class Benefit(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     grades = Column(ARRAY(String), nullable=True)  # List of eligible grades (e.g., ["1", "2", "3"]) 
+    __mapper_args__ = {"eager_defaults": True}
 
 class BenefitEnrollment(Base):
     __tablename__ = "benefit_enrollments"
     
     enrollment_id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     benefit_id = Column(Integer, ForeignKey("benefits.benefit_id"), nullable=False)
-    enrollment_status = Column(String, default="pending")  # pending, approved, rejected
+    enrollment_status = Column(request_status_enum, default=RequestStatus.pending, index=True)  # pending, approved, rejected
     enrollment_date = Column(DateTime(timezone=True), nullable=False)
     approved_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     approved_at = Column(DateTime(timezone=True), nullable=True)
@@ -199,6 +252,12 @@ class BenefitEnrollment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index('ix_benefit_enrollment_user_status_created', 'user_id', 'enrollment_status', 'created_at'),
+        Index('ix_benefit_enrollment_pending', 'user_id', 'created_at', postgresql_where=text("enrollment_status = 'pending'")),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Essential relationships
     user = relationship("User", foreign_keys=[user_id], back_populates="benefit_enrollments")
     benefit = relationship("Benefit")
@@ -209,7 +268,7 @@ class PerformanceGoal(Base):
     __tablename__ = "performance_goals"
     
     goal_id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
     target_date = Column(DateTime(timezone=True), nullable=False)
@@ -225,7 +284,7 @@ class PerformanceReview(Base):
     __tablename__ = "performance_reviews"
     
     review_id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     goal_id = Column(Integer, ForeignKey("performance_goals.goal_id"), nullable=False)
     year = Column(Integer, nullable=False)
     overall_rating = Column(Integer, nullable=True)
@@ -234,12 +293,18 @@ class PerformanceReview(Base):
     rating_quality = Column(Integer, nullable=True)
     rating_productivity = Column(Integer, nullable=True)
     rating_communication = Column(Integer, nullable=True)
-    status = Column(String, default="pending")  # pending, approved, rejected
+    status = Column(request_status_enum, default=RequestStatus.pending, index=True)  # pending, approved, rejected
     approver_rating_overall = Column(Integer, nullable=True)
     approver_comments = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index('ix_performance_review_user_status_created', 'user_id', 'status', 'created_at'),
+        Index('ix_performance_review_pending', 'user_id', 'created_at', postgresql_where=text("status = 'pending'")),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Relationships
     user = relationship("User", foreign_keys=[user_id], back_populates="performance_reviews")
     goal = relationship("PerformanceGoal", back_populates="reviews")
@@ -265,17 +330,32 @@ class Course(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     is_active = Column(Boolean, default=True)
 
+    __table_args__ = (
+        # Course listings filter active courses by category IN (...) and a start_date range
+        Index('ix_courses_active_category_start', 'category', 'start_date', postgresql_where=text("is_active")),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
 
     enrollments = relationship("Enrollment", back_populates="course",cascade="all, delete-orphan")
     completions = relationship("Completion", back_populates="course",cascade="all, delete-orphan")
 
-    @property
-    def duration_str(self):
+    @hybrid_property
+    def duration_days(self):
         if self.start_date and self.end_date:
-            days = (self.end_date - self.start_date).days
-            return f"{days} days"
+            return (self.end_date - self.start_date).days
         return None
 
+    @duration_days.expression
+    def duration_days(cls):
+        # date - date is an integer day count in PostgreSQL, so this can be filtered and sorted on in SQL
+        return type_coerce(cls.end_date - cls.start_date, Integer)
+
+    @property
+    def duration_str(self):
+        days = self.duration_days
+        return f"{days} days" if days is not None else None
+
 class Enrollment(Base):
     __tablename__ = "enrollments"
     
@@ -286,6 +366,12 @@ class Enrollment(Base):
     status = Column(String, nullable=False)  # 'active', 'completed', 'dropped'
     progress = Column(Integer, default=0)
 
+    __table_args__ = (
+        Index('ix_enrollments_user_enrolled', 'user_id', 'enrolled_at'),
+        Index('ix_enrollments_user_course', 'user_id', 'course_id'),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
     # Relationships
     user = relationship("User")
     course = relationship("Course", back_populates="enrollments")
@@ -299,6 +385,12 @@ class Completion(Base):
     completed_at = Column(DateTime(timezone=True), server_default=func.now())
     certificate_url = Column(String)
 
+    __table_args__ = (
+        Index('ix_completions_user_completed', 'user_id', 'completed_at'),
+        Index('ix_completions_user_course', 'user_id', 'course_id'),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
     # Relationships
     user = relationship("User")
     course = relationship("Course", back_populates="completions") 
@@ -308,16 +400,24 @@ class OvertimeRequest(Base):
     __tablename__ = "overtime_requests"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     date = Column(Date, nullable=False)
     hours = Column(Float, nullable=False)
     reason = Column(Text, nullable=True)
-    status = Column(String, default="pending")  # pending, approved, rejected
+    status = Column(request_status_enum, default=RequestStatus.pending, index=True)  # pending, approved, rejected
     approver_comments = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     attachment_id = Column(Integer, ForeignKey("attachments.id"), nullable=True)
     
+    __table_args__ = (
+        Index('ix_overtime_user_status_created', 'user_id', 'status', 'created_at'),
+        Index('ix_overtime_pending', 'user_id', 'created_at', postgresql_where=text("status = 'pending'")),
+        # Month/year range filters; scanned backwards for the newest-first ordering of overtime listings
+        Index('ix_overtime_user_date', 'user_id', 'date'),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Relationships
     user = relationship("User", back_populates="overtime_requests")
     attachment = relationship("Attachment")
@@ -326,12 +426,20 @@ class OvertimeRequest(Base):
 class OvertimeLeave(Base):
     __tablename__ = "overtime_leaves"
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     overtime_request_id = Column(Integer, ForeignKey("overtime_requests.id"), nullable=False)
     year = Column(Integer, nullable=False)
     ot_hours = Column(Float, nullable=False)
     leave_days = Column(Float, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # Covers the per-user yearly SUM(leave_days) without touching the heap
+    __table_args__ = (
+        Index('ix_overtime_leave_user_year', 'user_id', 'year', postgresql_include=['leave_days']),
+        # Granted leave days per request, read alongside overtime listings
+        Index('ix_overtime_leave_request', 'overtime_request_id', postgresql_include=['leave_days']),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+    
     user = relationship("User")
     overtime_request = relationship("OvertimeRequest") 
\ No newline at end of file
@@ -4,7 +4,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from database import get_db
 from schemas import Token, LoginRequest, MessageResponse
-from auth import authenticate_user, create_access_token, get_current_active_user
+from auth import authenticate_user, create_access_token, get_current_active_user, oauth2_scheme, revoke_token
 from config import ACCESS_TOKEN_EXPIRE_MINUTES
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
     summary="Login User (use your email as username)",
     # description="Authenticate user and return access token.\n\n**IMPORTANT:** Enter your email address (e.g., john.doe@noah.com) in the 'username' field. The backend will authenticate using your actual email address, not your username.\n\n- username: (enter your email address)\n- password: (enter your password)\n\nThis applies to both the /auth/login endpoint and the Swagger 'Authorize' button."
 )
-async def login_for_access_token(
+def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
@@ -33,11 +33,13 @@ async def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/logout", response_model=MessageResponse, summary="Logout User", description="Logout current user (client-side token removal)")
-async def logout(current_user = Depends(get_current_active_user)):
+def logout(token: str = Depends(oauth2_scheme), current_user = Depends(get_current_active_user)):
     """
-    Logout endpoint. In a stateless JWT implementation, logout is typically handled 
-    on the client side by removing the token. This endpoint confirms the user is authenticated.
+    Logout endpoint. When Redis is configured the token's jti is added to a revocation list
+    until it expires, so the token stops working immediately; otherwise logout is handled
+    on the client side by removing the token.
     """
+    revoke_token(token)
     return {"message": f"User {current_user.username} logged out successfully"}
 
 @router.get("/me", summary="Get Current User", description="Get current authenticated user information")
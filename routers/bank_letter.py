@@ -1,70 +1,131 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
-from database import get_db
+from urllib.parse import quote
+from pydantic import TypeAdapter
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Response
+from sqlalchemy import select, insert, update, tuple_, bindparam, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload
+from database import get_async_db, release_connection
 from models import User, BankLetterRequest, Attachment
-from schemas import BankLetterRequestCreate, BankLetterRequestResponse, BankLetterRequestUpdate, MessageResponse
-from auth import get_current_active_user
-from utils import verify_manager_permission
+from schemas import AttachmentResponse, BankLetterRequestCreate, BankLetterRequestResponse, BankLetterRequestUpdate, MessageResponse
+from auth import get_current_active_user, get_current_active_user_id
+from utils import verify_manager_permission, load_subordinate_ids, encode_cursor, decode_cursor
 
 router = APIRouter(prefix="/bank-letter", tags=["Bank Letter Requests"])
 
+# Read queries LEFT JOIN the (few, blob-less) attachments into the same SELECT and refuse any other lazy load
+_READ_OPTIONS = (joinedload(BankLetterRequest.attachments), raiseload("*", sql_only=True))
+
+# Hot lookups are built once with bound parameters so each request reuses the cached compilation
+_REQUEST_BY_ID = select(BankLetterRequest).options(*_READ_OPTIONS).where(BankLetterRequest.id == bindparam("request_id"))
+_REQUEST_OWNER = select(BankLetterRequest.user_id).where(BankLetterRequest.id == bindparam("request_id"))
+
+# List responses are validated and encoded to JSON in one pydantic-core pass instead of
+# FastAPI's validate -> dump to dicts -> json encode path
+_LIST_ADAPTER = TypeAdapter(List[BankLetterRequestResponse])
+
+def _list_response(rows, headers: Optional[dict] = None) -> Response:
+    items = _LIST_ADAPTER.validate_python(rows, from_attributes=True)
+    return Response(content=_LIST_ADAPTER.dump_json(items), media_type="application/json", headers=headers)
+
+def _content_disposition(file_name: str) -> str:
+    """
+    Content-Disposition for a user-supplied file name: an ASCII-only, quote-safe filename= fallback
+    plus the exact name as RFC 5987 filename*=UTF-8''... (header values must be latin-1 encodable).
+    """
+    fallback = "".join(
+        ch if " " <= ch <= "~" and ch not in '"\\;' else "_" for ch in file_name
+    ) or "attachment"
+    return f'attachment; filename="{fallback}"; filename*=UTF-8\'\'{quote(file_name or fallback, safe="")}'
+
 @router.post("/", response_model=BankLetterRequestResponse, summary="Request Bank Letter", description="Submit a new bank letter request with attachments")
 async def request_bank_letter(
     bank_letter_request: BankLetterRequestCreate, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_active_user)
 ):
-    # Create the bank letter request
-    db_bank_letter_request = BankLetterRequest(
+    # Create the bank letter request; RETURNING hands back the generated columns so no refresh SELECT is needed
+    created = (await db.execute(
+        insert(BankLetterRequest).values(
+            user_id=current_user.id,
+            bank_name=bank_letter_request.bankName,
+            type=bank_letter_request.type,
+            comment=bank_letter_request.comment
+        ).returning(BankLetterRequest.id, BankLetterRequest.status, BankLetterRequest.created_at)
+    )).one()
+    
+    # Create attachments in a single executemany INSERT
+    attachments = []
+    if bank_letter_request.attachments:
+        attachments = (await db.execute(
+            insert(Attachment).returning(Attachment.id, Attachment.file_name, Attachment.file_type, Attachment.file_desc),
+            [
+                {
+                    "file_name": attachment_data.fileName,
+                    "file_type": attachment_data.fileType,
+                    "file_desc": attachment_data.fileDesc,
+                    "file_data": attachment_data.fileData,
+                    "bank_letter_request_id": created.id
+                }
+                for attachment_data in bank_letter_request.attachments
+            ]
+        )).all()
+    
+    response = BankLetterRequestResponse(
+        id=created.id,
         user_id=current_user.id,
         bank_name=bank_letter_request.bankName,
-        type=bank_letter_request.type,
-        comment=bank_letter_request.comment
+        comment=bank_letter_request.comment,
+        status=created.status,
+        created_at=created.created_at,
+        attachments=[AttachmentResponse.model_validate(a) for a in attachments]
     )
-    db.add(db_bank_letter_request)
-    db.flush()  # Get the ID
-    
-    # Create attachments
-    for attachment_data in bank_letter_request.attachments:
-        attachment = Attachment(
-            file_name=attachment_data.fileName,
-            file_type=attachment_data.fileType,
-            file_desc=attachment_data.fileDesc,
-            file_data=attachment_data.fileData,
-            bank_letter_request_id=db_bank_letter_request.id
-        )
-        db.add(attachment)
-    
-    db.commit()
-    db.refresh(db_bank_letter_request)
-    return db_bank_letter_request
+    await db.commit()
+    return response
 
 @router.get("/", response_model=List[BankLetterRequestResponse], summary="Get My Bank Letter Requests", description="Retrieve all bank letter requests for current user")
 async def get_my_bank_letter_requests(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db), 
+    current_user_id: int = Depends(get_current_active_user_id)
 ):
-    bank_letter_requests = db.query(BankLetterRequest).filter(BankLetterRequest.user_id == current_user.id).all()
-    return bank_letter_requests
+    bank_letter_requests = (await db.scalars(
+        select(BankLetterRequest).options(*_READ_OPTIONS).where(BankLetterRequest.user_id == current_user_id)
+    )).unique().all()
+    await release_connection(db)
+    return _list_response(bank_letter_requests)
 
-@router.get("/all", response_model=List[BankLetterRequestResponse], summary="Get All Bank Letter Requests", description="Retrieve all bank letter requests (HR function)")
+@router.get("/all", response_model=List[BankLetterRequestResponse], summary="Get All Bank Letter Requests", description="Retrieve all bank letter requests (HR function), newest first. Pass the X-Next-Cursor response header back as `after` to fetch the next page.")
 async def get_all_bank_letter_requests(
+    after: Optional[str] = None,
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_active_user)
 ):
-    bank_letter_requests = db.query(BankLetterRequest).offset(skip).limit(limit).all()
-    return bank_letter_requests
+    query = select(BankLetterRequest).options(*_READ_OPTIONS).order_by(
+        BankLetterRequest.created_at.desc(), BankLetterRequest.id.desc()
+    )
+    if after:
+        # Keyset pagination: seek past the last row of the previous page instead of scanning skipped rows
+        query = query.where(tuple_(BankLetterRequest.created_at, BankLetterRequest.id) < tuple_(*decode_cursor(after)))
+    elif skip:
+        query = query.offset(skip)
+    bank_letter_requests = (await db.scalars(query.limit(limit))).unique().all()
+    await release_connection(db)
+    headers = None
+    if len(bank_letter_requests) == limit:
+        last = bank_letter_requests[-1]
+        headers = {"X-Next-Cursor": encode_cursor(last.created_at, last.id)}
+    return _list_response(bank_letter_requests, headers)
 
 @router.get("/{request_id}", response_model=BankLetterRequestResponse, summary="Get Bank Letter Request by ID", description="Retrieve a specific bank letter request by ID")
 async def get_bank_letter_request(
     request_id: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_active_user)
 ):
-    bank_letter_request = db.query(BankLetterRequest).filter(BankLetterRequest.id == request_id).first()
+    # Attachment bytes are served by the download endpoint below, not inlined as base64
+    bank_letter_request = await db.scalar(_REQUEST_BY_ID, {"request_id": request_id})
     if bank_letter_request is None:
         raise HTTPException(status_code=404, detail="Bank letter request not found")
     
@@ -75,31 +136,66 @@ async def get_bank_letter_request(
     
     return bank_letter_request
 
+@router.get("/{request_id}/attachments/{attachment_id}", response_class=Response, summary="Download Bank Letter Attachment", description="Download the raw file of a bank letter request attachment")
+async def download_bank_letter_attachment(
+    request_id: int,
+    attachment_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    # Only the blob and its name are read; the bytes go out as-is instead of base64 inside JSON.
+    # The caller must own the request or manage its owner; anything else is reported as not found.
+    attachment = (await db.execute(
+        select(Attachment.file_name, Attachment.file_data)
+        .join(BankLetterRequest, BankLetterRequest.id == Attachment.bank_letter_request_id)
+        .where(
+            Attachment.id == attachment_id,
+            BankLetterRequest.id == request_id,
+            or_(
+                BankLetterRequest.user_id == current_user.id,
+                BankLetterRequest.user_id.in_(select(User.id).where(User.manager_id == current_user.id))
+            )
+        )
+    )).one_or_none()
+    if attachment is None:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    
+    return Response(
+        content=bytes(attachment.file_data),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": _content_disposition(attachment.file_name or "")}
+    )
+
 @router.put("/{request_id}", response_model=BankLetterRequestResponse, summary="Update Bank Letter Request Status", description="Approve/reject a bank letter request (HR function)")
 async def update_bank_letter_request(
     request_id: int, 
     update_data: BankLetterRequestUpdate, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_active_user)
 ):
-    bank_letter_request = db.query(BankLetterRequest).filter(BankLetterRequest.id == request_id).first()
+    # Single UPDATE ... RETURNING instead of SELECT, UPDATE and a refresh SELECT
+    bank_letter_request = (await db.scalars(
+        update(BankLetterRequest)
+        .where(BankLetterRequest.id == request_id)
+        .values(status=update_data.status, approver_comments=update_data.approver_comments)
+        .returning(BankLetterRequest),
+        execution_options={"synchronize_session": False}
+    )).one_or_none()
     if bank_letter_request is None:
         raise HTTPException(status_code=404, detail="Bank letter request not found")
     
-    bank_letter_request.status = update_data.status
-    bank_letter_request.approver_comments = update_data.approver_comments
-    
-    db.commit()
-    db.refresh(bank_letter_request)
-    return bank_letter_request
+    # Serialize before commit so the returned row is not expired and reloaded
+    response = BankLetterRequestResponse.model_validate(bank_letter_request)
+    await db.commit()
+    return response
 
 @router.delete("/{request_id}", response_model=MessageResponse, summary="Delete Bank Letter Request", description="Delete a bank letter request (only if pending)")
 async def delete_bank_letter_request(
     request_id: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_active_user)
 ):
-    bank_letter_request = db.query(BankLetterRequest).filter(BankLetterRequest.id == request_id).first()
+    bank_letter_request = await db.get(BankLetterRequest, request_id)
     if bank_letter_request is None:
         raise HTTPException(status_code=404, detail="Bank letter request not found")
     
@@ -110,95 +206,71 @@ async def delete_bank_letter_request(
     if bank_letter_request.status != "pending":
         raise HTTPException(status_code=400, detail="Can only delete pending requests")
     
-    db.delete(bank_letter_request)
-    db.commit()
+    await db.delete(bank_letter_request)
+    await db.commit()
     return {"message": "Bank letter request deleted successfully"}
 
-def is_manager(db: Session, user: User) -> bool:
-    """Check if user is a manager (has subordinates)"""
-    # Check if any user has this user as their manager
-    subordinates = db.query(User).filter(User.manager_id == user.id).first()
-    return subordinates is not None
-
-def is_subordinate(db: Session, manager: User, user_id: int) -> bool:
-    """Check if user_id is a subordinate of the manager"""
-    # Get the target user
-    target_user = db.query(User).filter(User.id == user_id).first()
-    if not target_user:
-        return False
-    # Check if target user's manager is the given manager
-    return target_user.manager_id == manager.id
+async def _decide_pending_bank_letter_request(db: AsyncSession, request_id: int, current_user: User, new_status: str, approver_comments: Optional[str]) -> BankLetterRequestResponse:
+    """
+    Move a pending bank letter request to new_status with one guarded UPDATE ... RETURNING.
+    Both the pending check and the caller's authority over the request's owner are part of the
+    WHERE clause, so the common case is a single round trip and of two concurrent approvers only one wins.
+    """
+    bank_letter_request = (await db.scalars(
+        update(BankLetterRequest)
+        .where(
+            BankLetterRequest.id == request_id,
+            BankLetterRequest.status == "pending",
+            BankLetterRequest.user_id.in_(select(User.id).where(User.manager_id == current_user.id))
+        )
+        .values(status=new_status, approver_comments=approver_comments)
+        .returning(BankLetterRequest),
+        execution_options={"synchronize_session": False}
+    )).one_or_none()
+    if bank_letter_request is None:
+        # Only on failure: work out which guard failed, in the order the errors were always reported
+        user_id = await db.scalar(_REQUEST_OWNER, {"request_id": request_id})
+        if user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Bank letter request not found"
+            )
+        # Resolve the team with the async Redis client before entering the sync helper
+        await load_subordinate_ids(db, current_user)
+        await db.run_sync(verify_manager_permission, current_user, user_id)
+        current_status = await db.scalar(select(BankLetterRequest.status).where(BankLetterRequest.id == request_id))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Request is already {current_status}"
+        )
+    
+    # Serialize before commit so the returned row is not expired and reloaded
+    response = BankLetterRequestResponse.model_validate(bank_letter_request)
+    await db.commit()
+    return response
 
 @router.put("/{request_id}/approve", response_model=BankLetterRequestResponse)
 async def approve_bank_letter_request(
     request_id: int,
     approver_comments: Optional[str] = Body(None, embed=True),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Approve a bank letter request.
     Only managers can approve requests for their subordinates.
     """
-    # Get the request
-    bank_letter_request = db.query(BankLetterRequest).filter(BankLetterRequest.id == request_id).first()
-    if not bank_letter_request:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Bank letter request not found"
-        )
-    
-    # Check if request is already approved or rejected
-    if bank_letter_request.status != "pending":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Request is already {bank_letter_request.status}"
-        )
-    
-    # Verify manager permissions
-    verify_manager_permission(db, current_user, bank_letter_request.user_id)
-    
-    # Update the request
-    bank_letter_request.status = "approved"
-    bank_letter_request.approver_comments = approver_comments
-    
-    db.commit()
-    db.refresh(bank_letter_request)
-    return bank_letter_request
+    return await _decide_pending_bank_letter_request(db, request_id, current_user, "approved", approver_comments)
 
 @router.put("/{request_id}/reject", response_model=BankLetterRequestResponse)
 async def reject_bank_letter_request(
     request_id: int,
     approver_comments: Optional[str] = Body(None, embed=True),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Reject a bank letter request.
     Only managers can reject requests for their subordinates.
     """
-    # Get the request
-    bank_letter_request = db.query(BankLetterRequest).filter(BankLetterRequest.id == request_id).first()
-    if not bank_letter_request:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Bank letter request not found"
-        )
-    
-    # Check if request is already approved or rejected
-    if bank_letter_request.status != "pending":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Request is already {bank_letter_request.status}"
-        )
-    
-    # Verify manager permissions
-    verify_manager_permission(db, current_user, bank_letter_request.user_id)
-    
-    # Update the request
-    bank_letter_request.status = "rejected"
-    bank_letter_request.approver_comments = approver_comments
-    
-    db.commit()
-    db.refresh(bank_letter_request)
-    return bank_letter_request 
\ No newline at end of file
+    return await _decide_pending_bank_letter_request(db, request_id, current_user, "rejected", approver_comments)
@@ -1,20 +1,58 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from database import get_db
+from typing import List, Optional
+from pydantic import TypeAdapter
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select, insert, update, tuple_, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from database import get_async_db, release_connection
+from config import MAX_PAGE_SIZE
 from models import User, LeaveRequest, LeaveBalance, OvertimeRequest, OvertimeLeave
-from schemas import LeaveRequestCreate, LeaveRequestResponse, LeaveRequestUpdate, LeaveBalanceResponse, MessageResponse, LeaveRequestWithEmployeeResponse
-from auth import get_current_active_user
-from utils import verify_manager_permission, is_manager
+from schemas import LeaveRequestCreate, LeaveRequestResponse, LeaveRequestUpdate, LeaveRequestBulkApprove, LeaveBalanceResponse, MessageResponse, LeaveRequestWithEmployeeResponse
+from auth import get_current_active_user, get_current_active_user_id
+from utils import verify_manager_permission, load_subordinate_ids, is_manager, encode_cursor, decode_cursor
 from datetime import datetime, timedelta
 from sqlalchemy import extract
 from sqlalchemy.sql import func
-from api_utils.leave import is_leave_type_eligible
+from api_utils.leave import is_leave_type_eligible, eligible_leave_types
+from cache import (
+    leave_balance_cache, overtime_leave_cache, get_or_load_shared, invalidate_shared_async,
+    leave_balance_key, overtime_leave_key,
+)
 
 router = APIRouter(prefix="/leave", tags=["Leave Management"])
 
+# Leave responses never touch relationships; refuse any lazy load instead of silently issuing one per row
+_READ_OPTIONS = (raiseload("*", sql_only=True),)
+
+# Read-only listings select plain columns: rows skip the identity map and attribute instrumentation
+# and validate straight into the response models
+_LEAVE_REQUEST_COLUMNS = tuple(LeaveRequest.__table__.c)
+_BALANCE_COLUMNS = tuple(LeaveBalance.__table__.c)
+
+# Hot lookups are built once with bound parameters: each request reuses the same statement object
+# and its cached compilation instead of rebuilding the expression tree and cache key
+_LEAVE_REQUEST_OWNER = select(LeaveRequest.user_id).where(LeaveRequest.id == bindparam("request_id"))
+
+_BALANCES_ADAPTER = TypeAdapter(List[LeaveBalanceResponse])
+
+# List responses are validated and encoded to JSON in one pydantic-core pass instead of
+# FastAPI's validate -> dump to dicts -> json encode path
+_REQUESTS_ADAPTER = TypeAdapter(List[LeaveRequestResponse])
+_REQUESTS_WITH_EMPLOYEE_ADAPTER = TypeAdapter(List[LeaveRequestWithEmployeeResponse])
+
+def _list_response(adapter: TypeAdapter, rows, headers: Optional[dict] = None) -> Response:
+    items = adapter.validate_python(rows, from_attributes=True)
+    return Response(content=adapter.dump_json(items), media_type="application/json", headers=headers)
+
+_OT_DAYS_ADAPTER = TypeAdapter(float)
+
+async def _cached_leave_balances(db: AsyncSession, user_id: int) -> List[LeaveBalanceResponse]:
+    async def load():
+        rows = await db.execute(select(*_BALANCE_COLUMNS).where(LeaveBalance.user_id == user_id))
+        return [LeaveBalanceResponse.model_validate(row) for row in rows]
+    return await get_or_load_shared(leave_balance_cache, user_id, leave_balance_key(user_id), _BALANCES_ADAPTER, load)
+
 # Allowed leave types and their default balances
-ALLOWED_LEAVE_TYPES = ["Annual", "Sick", "Casual", "Maternity", "Paternity", "Hajj"]
 DEFAULT_LEAVE_BALANCES = {
     "Annual": 25.0,
     "Sick": 10.0,
@@ -23,42 +61,43 @@ DEFAULT_LEAVE_BALANCES = {
     "Paternity": 10.0,
     "Hajj": 30.0
 }
+ALLOWED_LEAVE_TYPES = tuple(DEFAULT_LEAVE_BALANCES)  # ordered, for messages and listings
+_ALLOWED_LEAVE_TYPE_SET = frozenset(ALLOWED_LEAVE_TYPES)
+
+_INELIGIBLE_MESSAGES = {
+    "Maternity": "Maternity leave is only available for female employees.",
+    "Paternity": "Paternity leave is only available for male employees.",
+    "Hajj": "Hajj leave is only available for Muslim employees.",
+}
 
 def validate_leave_type(leave_type: str, user=None):
-    if leave_type not in ALLOWED_LEAVE_TYPES:
+    if leave_type not in _ALLOWED_LEAVE_TYPE_SET:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid leave type '{leave_type}'. Allowed types: {', '.join(ALLOWED_LEAVE_TYPES)}"
         )
     # Eligibility checks
-    if user:
-        if leave_type == "Maternity" and user.gender.lower() != "female":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Maternity leave is only available for female employees."
-            )
-        if leave_type == "Paternity" and user.gender.lower() != "male":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Paternity leave is only available for male employees."
-            )
-        if leave_type == "Hajj" and user.religion.strip().lower() != "muslim":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Hajj leave is only available for Muslim employees."
-            )
+    if user and not is_leave_type_eligible(user, leave_type):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_INELIGIBLE_MESSAGES[leave_type]
+        )
 
-def check_leave_balance(db: Session, user_id: int, leave_type: str, days_requested: float) -> None:
+async def check_leave_balance(db: AsyncSession, user_id: int, leave_type: str, days_requested: float, current_year: Optional[int] = None) -> None:
     """
     Check if user has sufficient leave balance.
     Raises HTTPException if balance is insufficient.
     """
-    current_year = datetime.now().year
-    leave_balance = db.query(LeaveBalance).filter(
-        LeaveBalance.user_id == user_id,
-        LeaveBalance.leave_type == leave_type,
-        LeaveBalance.year == current_year
-    ).first()
+    # Served from the shared per-user balance cache; the deduction itself is re-checked by the
+    # guarded UPDATE in update_leave_balance, so a briefly stale answer here can't overspend.
+    # Balance rows are created for the app clock's year, so every lookup uses that same clock.
+    if current_year is None:
+        current_year = datetime.now().year
+    leave_balance = next(
+        (balance for balance in await _cached_leave_balances(db, user_id)
+         if balance.leave_type == leave_type and balance.year == current_year),
+        None
+    )
     
     if not leave_balance:
         raise HTTPException(
@@ -72,89 +111,113 @@ def check_leave_balance(db: Session, user_id: int, leave_type: str, days_request
             detail=f"Insufficient {leave_type} leave balance. You have {leave_balance.remaining_days} days remaining, but requested {days_requested} days"
         )
 
-def update_leave_balance(db: Session, user_id: int, leave_type: str, days_requested: float) -> None:
+async def update_leave_balance(db: AsyncSession, user_id: int, leave_type: str, days_requested: float) -> float:
     """
-    Update leave balance by deducting the requested days.
+    Deduct the requested days from this year's balance and return what remains.
+    The sufficiency check is part of the UPDATE's WHERE clause, so two concurrent
+    approvals cannot both spend the same days. Raises like check_leave_balance when
+    nothing could be deducted.
     """
     current_year = datetime.now().year
-    leave_balance = db.query(LeaveBalance).filter(
-        LeaveBalance.user_id == user_id,
-        LeaveBalance.leave_type == leave_type,
-        LeaveBalance.year == current_year
-    ).first()
-    
-    if not leave_balance:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"No leave balance found for {leave_type} leave in {current_year}"
+    remaining_days = await db.scalar(
+        update(LeaveBalance)
+        .where(
+            LeaveBalance.user_id == user_id,
+            LeaveBalance.leave_type == leave_type,
+            LeaveBalance.year == current_year,
+            LeaveBalance.remaining_days >= days_requested
         )
-    
-    leave_balance.used_days += days_requested
-    leave_balance.remaining_days -= days_requested
-    
-    if leave_balance.remaining_days < 0:
+        .values(
+            used_days=LeaveBalance.used_days + days_requested,
+            remaining_days=LeaveBalance.remaining_days - days_requested
+        )
+        .returning(LeaveBalance.remaining_days),
+        execution_options={"synchronize_session": False}
+    )
+    if remaining_days is None:
+        # Only on failure: look the row up to report a missing balance vs. an insufficient one
+        await check_leave_balance(db, user_id, leave_type, days_requested, current_year)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot approve leave request. It would result in negative balance for {leave_type} leave"
+            detail=f"Insufficient {leave_type} leave balance for the requested {days_requested} days"
         )
+    return remaining_days
 
-def has_overlapping_leave(db: Session, user_id: int, start_date, end_date) -> bool:
-    overlapping = db.query(LeaveRequest).filter(
+async def has_overlapping_leave(db: AsyncSession, user_id: int, start_date, end_date) -> bool:
+    # EXISTS lets the server stop at the first matching index entry without fetching the row
+    return await db.scalar(select(select(LeaveRequest.id).where(
         LeaveRequest.user_id == user_id,
         LeaveRequest.status.in_(["pending", "approved"]),
         LeaveRequest.start_date <= end_date,
         LeaveRequest.end_date >= start_date
-    ).first()
-    return overlapping is not None
+    ).exists()))
 
 # Leave Request Endpoints
 @router.post("/requests", response_model=LeaveRequestResponse, summary="Apply for Leave", description="Submit a new leave request. Allowed leave types: Annual, Sick, Casual, Maternity, Paternity, Hajj.")
 async def apply_leave(
     leave_request: LeaveRequestCreate, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_active_user)
 ):
     validate_leave_type(leave_request.leave_type, user=current_user)
-    check_leave_balance(db, current_user.id, leave_request.leave_type, leave_request.days_requested)
+    await check_leave_balance(db, current_user.id, leave_request.leave_type, leave_request.days_requested)
     # Check for overlapping leave requests
-    if has_overlapping_leave(db, current_user.id, leave_request.start_date, leave_request.end_date):
+    if await has_overlapping_leave(db, current_user.id, leave_request.start_date, leave_request.end_date):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You already have a leave request (pending or approved) that overlaps with the requested dates."
         )
-    db_leave_request = LeaveRequest(
-        user_id=current_user.id,
-        leave_type=leave_request.leave_type,
-        start_date=leave_request.start_date,
-        end_date=leave_request.end_date,
-        days_requested=leave_request.days_requested,
-        reason=leave_request.reason
+    # RETURNING hands back the server-generated columns (id, status, created_at), so no refresh SELECT is needed
+    db_leave_request = await db.scalar(
+        insert(LeaveRequest).values(
+            user_id=current_user.id,
+            leave_type=leave_request.leave_type,
+            start_date=leave_request.start_date,
+            end_date=leave_request.end_date,
+            days_requested=leave_request.days_requested,
+            reason=leave_request.reason
+        ).returning(LeaveRequest)
     )
-    db.add(db_leave_request)
-    db.commit()
-    db.refresh(db_leave_request)
+    await db.commit()
     return db_leave_request
 
 @router.get("/requests", response_model=List[LeaveRequestResponse], summary="Get My Leave Requests", description="Retrieve all leave requests for current user")
 async def get_my_leave_requests(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db), 
+    current_user_id: int = Depends(get_current_active_user_id)
 ):
-    leave_requests = db.query(LeaveRequest).filter(LeaveRequest.user_id == current_user.id).all()
-    return leave_requests
+    rows = (await db.execute(select(*_LEAVE_REQUEST_COLUMNS).where(LeaveRequest.user_id == current_user_id))).all()
+    await release_connection(db)
+    return _list_response(_REQUESTS_ADAPTER, rows)
 
-@router.get("/requests/all", response_model=List[LeaveRequestResponse], summary="Get All Leave Requests", description="Retrieve all leave requests (manager/HR function)")
+@router.get("/requests/all", response_model=List[LeaveRequestResponse], summary="Get All Leave Requests", description="Retrieve all leave requests (manager/HR function), newest first. Pass the X-Next-Cursor response header back as `after` to fetch the next page.")
 async def get_all_leave_requests(
+    after: Optional[str] = None,
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_active_user)
 ):
 
-    if not is_manager(db, current_user):
+    if not await db.run_sync(is_manager, current_user):
         raise HTTPException(status_code=403, detail="Only managers can view all leave requests.")
-    leave_requests = db.query(LeaveRequest).offset(skip).limit(limit).all()
-    return leave_requests
+    # Bound the page so one call cannot buffer an arbitrarily large result set
+    limit = min(limit, MAX_PAGE_SIZE)
+    query = select(*_LEAVE_REQUEST_COLUMNS).order_by(
+        LeaveRequest.created_at.desc(), LeaveRequest.id.desc()
+    )
+    if after:
+        # Keyset pagination: seek past the last row of the previous page instead of scanning skipped rows
+        query = query.where(tuple_(LeaveRequest.created_at, LeaveRequest.id) < tuple_(*decode_cursor(after)))
+    elif skip:
+        query = query.offset(skip)
+    rows = (await db.execute(query.limit(limit))).all()
+    await release_connection(db)
+    headers = None
+    if len(rows) == limit:
+        last = rows[-1]
+        headers = {"X-Next-Cursor": encode_cursor(last.created_at, last.id)}
+    return _list_response(_REQUESTS_ADAPTER, rows, headers)
 
 @router.get(
     "/requests/pending-approval",
@@ -163,56 +226,36 @@ async def get_all_leave_requests(
     description="Retrieve all pending leave requests for subordinates of the current manager"
 )
 async def get_pending_requests_for_manager_approval(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    if not is_manager(db, current_user):
-        raise HTTPException(status_code=403, detail="Only managers can view pending leave requests for approval.")
-
-    subordinates = db.query(User).filter(User.manager_id == current_user.id).all()
-    if not subordinates:
-        return []
-
-    subordinate_ids = [s.id for s in subordinates]
-
-    leave_requests = (
-        db.query(LeaveRequest)
-        .options(joinedload(LeaveRequest.user))
-        .filter(
-            LeaveRequest.user_id.in_(subordinate_ids),
-            LeaveRequest.status == "pending"
+    # One query: join each pending request to its owner and keep only the current user's direct reports.
+    # Plain rows (no ORM entities) carry the employee columns under the response's field names.
+    rows = (await db.execute(
+        select(
+            *_LEAVE_REQUEST_COLUMNS,
+            User.username.label("employee_name"),
+            User.email.label("employee_email"),
         )
-        .all()
-    )
-
-    result = []
-    for req in leave_requests:
-        result.append(
-            LeaveRequestWithEmployeeResponse(
-                id=req.id,
-                user_id=req.user_id,
-                leave_type=req.leave_type,
-                start_date=req.start_date,
-                end_date=req.end_date,
-                days_requested=req.days_requested,
-                reason=req.reason,
-                status=req.status,
-                approver_comments=req.approver_comments,
-                created_at=req.created_at,
-                updated_at=req.updated_at,
-                employee_name=req.user.username if req.user else None,
-                employee_email=req.user.email if req.user else None,
-            )
+        .join(User, LeaveRequest.user_id == User.id)
+        .where(
+            User.manager_id == current_user.id,
+            LeaveRequest.status == "pending"
         )
-    return result
+    )).all()
+    # Any row proves the caller has direct reports; only an empty result needs the manager check
+    if not rows and not await db.run_sync(is_manager, current_user):
+        raise HTTPException(status_code=403, detail="Only managers can view pending leave requests for approval.")
+    await release_connection(db)
+    return _list_response(_REQUESTS_WITH_EMPLOYEE_ADAPTER, rows)
 
 @router.get("/requests/{request_id}", response_model=LeaveRequestResponse, summary="Get Leave Request by ID", description="Retrieve a specific leave request by ID")
 async def get_leave_request(
     request_id: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_active_user)
 ):
-    leave_request = db.query(LeaveRequest).filter(LeaveRequest.id == request_id).first()
+    leave_request = await db.get(LeaveRequest, request_id, options=_READ_OPTIONS)
     if leave_request is None:
         raise HTTPException(status_code=404, detail="Leave request not found")
     
@@ -227,122 +270,192 @@ async def get_leave_request(
 async def update_leave_request(
     request_id: int, 
     update_data: LeaveRequestUpdate, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_active_user)
 ):
-    leave_request = db.query(LeaveRequest).filter(LeaveRequest.id == request_id).first()
+    # Single UPDATE ... RETURNING instead of SELECT, UPDATE and a refresh SELECT
+    leave_request = (await db.scalars(
+        update(LeaveRequest)
+        .where(LeaveRequest.id == request_id)
+        .values(status=update_data.status, approver_comments=update_data.approver_comments)
+        .returning(LeaveRequest),
+        execution_options={"synchronize_session": False}
+    )).one_or_none()
     if leave_request is None:
         raise HTTPException(status_code=404, detail="Leave request not found")
     
-    leave_request.status = update_data.status
-    leave_request.approver_comments = update_data.approver_comments
-    
-    db.commit()
-    db.refresh(leave_request)
+    await db.commit()
+    return leave_request
+
+async def _decide_pending_leave_request(db: AsyncSession, request_id: int, current_user: User, new_status: str, approver_comments: Optional[str]) -> LeaveRequest:
+    """
+    Move a pending leave request to new_status with one guarded UPDATE ... RETURNING.
+    Both the pending check and the caller's authority over the request's owner are part of the
+    WHERE clause, so the common case is a single round trip and of two concurrent approvers only one wins.
+    """
+    leave_request = (await db.scalars(
+        update(LeaveRequest)
+        .where(
+            LeaveRequest.id == request_id,
+            LeaveRequest.status == "pending",
+            LeaveRequest.user_id.in_(select(User.id).where(User.manager_id == current_user.id))
+        )
+        .values(status=new_status, approver_comments=approver_comments)
+        .returning(LeaveRequest),
+        execution_options={"synchronize_session": False}
+    )).one_or_none()
+    if leave_request is None:
+        # Only on failure: work out which guard failed, in the order the errors were always reported
+        user_id = await db.scalar(_LEAVE_REQUEST_OWNER, {"request_id": request_id})
+        if user_id is None:
+            raise HTTPException(status_code=404, detail="Leave request not found")
+        # Resolve the team with the async Redis client before entering the sync helper
+        await load_subordinate_ids(db, current_user)
+        await db.run_sync(verify_manager_permission, current_user, user_id)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This leave request has already been processed"
+        )
     return leave_request
 
 @router.put("/requests/{request_id}/approve", response_model=LeaveRequestResponse, summary="Approve Leave Request", description="Approve a leave request (manager function)")
 async def approve_leave_request(
     request_id: int,
     approver_comments: str = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    leave_request = db.query(LeaveRequest).filter(LeaveRequest.id == request_id).first()
-    if leave_request is None:
-        raise HTTPException(status_code=404, detail="Leave request not found")
-    
-    # Verify manager permissions
-    verify_manager_permission(db, current_user, leave_request.user_id)
-    
-    # Check if request is already processed
-    if leave_request.status != "pending":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="This leave request has already been processed"
-        )
+    leave_request = await _decide_pending_leave_request(db, request_id, current_user, "approved", approver_comments)
     
     try:
-        # Double check leave balance before approving
-        check_leave_balance(db, leave_request.user_id, leave_request.leave_type, leave_request.days_requested)
-        
-        # Update leave request status
-        leave_request.status = "approved"
-        leave_request.approver_comments = approver_comments
-        
-        # Update leave balance
-        update_leave_balance(db, leave_request.user_id, leave_request.leave_type, leave_request.days_requested)
-        
-        db.commit()
-        db.refresh(leave_request)
-        return leave_request
-        
+        # Check and deduct the balance in one statement
+        await update_leave_balance(db, leave_request.user_id, leave_request.leave_type, leave_request.days_requested)
     except HTTPException as e:
         if e.status_code == status.HTTP_400_BAD_REQUEST and "Insufficient" in str(e.detail):
-            # Auto-reject the request with clear reason
-            leave_request.status = "rejected"
-            leave_request.approver_comments = f"Request automatically rejected: {str(e.detail)}"
-            db.commit()
-            db.refresh(leave_request)
+            # Auto-reject the request with clear reason; the row is still locked by this transaction
+            leave_request = (await db.scalars(
+                update(LeaveRequest)
+                .where(LeaveRequest.id == request_id)
+                .values(status="rejected", approver_comments=f"Request automatically rejected: {str(e.detail)}")
+                .returning(LeaveRequest),
+                execution_options={"synchronize_session": "fetch"}
+            )).one()
+            await db.commit()
             return leave_request
         else:
-            # Re-raise other HTTP exceptions
+            # Re-raise other HTTP exceptions; the approval is rolled back with the session
             raise
+    
+    await db.commit()
+    await invalidate_shared_async(leave_balance_cache, leave_request.user_id, leave_balance_key(leave_request.user_id))
+    return leave_request
 
-@router.put("/requests/{request_id}/reject", response_model=LeaveRequestResponse, summary="Reject Leave Request", description="Reject a leave request (manager function)")
-async def reject_leave_request(
-    request_id: int,
-    approver_comments: str = None,
-    db: Session = Depends(get_db),
+@router.post("/requests/bulk-approve", response_model=List[LeaveRequestResponse], summary="Bulk Approve Leave Requests", description="Approve several leave requests at once (manager function). Only pending requests of the caller's direct reports are processed; a request whose balance is insufficient is automatically rejected, as with single approval.")
+async def bulk_approve_leave_requests(
+    bulk: LeaveRequestBulkApprove,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    leave_request = db.query(LeaveRequest).filter(LeaveRequest.id == request_id).first()
-    if leave_request is None:
-        raise HTTPException(status_code=404, detail="Leave request not found")
-    
-    # Verify manager permissions
-    verify_manager_permission(db, current_user, leave_request.user_id)
+    # Lock the requests, then the balances they draw on, always in id order so that concurrent
+    # batches wait on each other instead of deadlocking
+    requests = (await db.execute(
+        select(LeaveRequest.id, LeaveRequest.user_id, LeaveRequest.leave_type, LeaveRequest.days_requested)
+        .where(
+            LeaveRequest.id.in_(bulk.request_ids),
+            LeaveRequest.status == "pending",
+            LeaveRequest.user_id.in_(select(User.id).where(User.manager_id == current_user.id))
+        )
+        .order_by(LeaveRequest.id)
+        .with_for_update()
+    )).all()
+    if not requests:
+        return []
     
-    # Check if request is already processed
-    if leave_request.status != "pending":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="This leave request has already been processed"
+    current_year = datetime.now().year
+    pairs = {(r.user_id, r.leave_type) for r in requests}
+    balances = {
+        (b.user_id, b.leave_type): b._asdict()
+        for b in await db.execute(
+            select(LeaveBalance.id, LeaveBalance.user_id, LeaveBalance.leave_type, LeaveBalance.used_days, LeaveBalance.remaining_days)
+            .where(
+                tuple_(LeaveBalance.user_id, LeaveBalance.leave_type).in_(pairs),
+                LeaveBalance.year == current_year
+            )
+            .order_by(LeaveBalance.id)
+            .with_for_update()
         )
+    }
     
-    # Update leave request
-    leave_request.status = "rejected"
-    leave_request.approver_comments = approver_comments
+    # Deduct in memory in request order; a request that no longer fits is auto-rejected
+    decisions = []
+    deducted = {}
+    for r in requests:
+        balance = balances.get((r.user_id, r.leave_type))
+        if balance is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"No leave balance found for {r.leave_type} leave in {current_year} (request {r.id})"
+            )
+        if balance["remaining_days"] < r.days_requested:
+            detail = f"Insufficient {r.leave_type} leave balance. You have {balance['remaining_days']} days remaining, but requested {r.days_requested} days"
+            decisions.append({"id": r.id, "status": "rejected", "approver_comments": f"Request automatically rejected: {detail}"})
+            continue
+        balance["used_days"] += r.days_requested
+        balance["remaining_days"] -= r.days_requested
+        deducted[balance["id"]] = balance
+        decisions.append({"id": r.id, "status": "approved", "approver_comments": bulk.approver_comments})
     
-    db.commit()
-    db.refresh(leave_request)
+    # One executemany per table (ORM bulk UPDATE by primary key)
+    await db.execute(update(LeaveRequest), decisions)
+    if deducted:
+        await db.execute(
+            update(LeaveBalance),
+            [{"id": b["id"], "used_days": b["used_days"], "remaining_days": b["remaining_days"]} for b in deducted.values()]
+        )
+    await db.commit()
+    for user_id in {r.user_id for r in requests}:
+        await invalidate_shared_async(leave_balance_cache, user_id, leave_balance_key(user_id))
+    
+    rows = (await db.execute(
+        select(*_LEAVE_REQUEST_COLUMNS).where(LeaveRequest.id.in_([r.id for r in requests])).order_by(LeaveRequest.id)
+    )).all()
+    await release_connection(db)
+    return _list_response(_REQUESTS_ADAPTER, rows)
+
+@router.put("/requests/{request_id}/reject", response_model=LeaveRequestResponse, summary="Reject Leave Request", description="Reject a leave request (manager function)")
+async def reject_leave_request(
+    request_id: int,
+    approver_comments: str = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    leave_request = await _decide_pending_leave_request(db, request_id, current_user, "rejected", approver_comments)
+    await db.commit()
     return leave_request
 
 # Leave Balance Endpoints
 @router.get("/balance", response_model=List[LeaveBalanceResponse], summary="Get My Leave Balance", description="Retrieve leave balance for current user")
 async def get_my_leave_balance(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db), 
+    current_user_id: int = Depends(get_current_active_user_id)
 ):
-    leave_balances = db.query(LeaveBalance).filter(LeaveBalance.user_id == current_user.id).all()
-    return leave_balances
+    return await _cached_leave_balances(db, current_user_id)
 
 @router.get("/balance/{user_id}", response_model=List[LeaveBalanceResponse], summary="Get Leave Balance by User ID", description="Retrieve leave balance for a specific user (manager/HR function)")
 async def get_user_leave_balance(
     user_id: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_active_user)
 ):
-    leave_balances = db.query(LeaveBalance).filter(LeaveBalance.user_id == user_id).all()
-    return leave_balances
+    return await _cached_leave_balances(db, user_id)
 
 @router.delete("/requests/{request_id}", response_model=MessageResponse, summary="Delete Leave Request", description="Delete a leave request (only if pending)")
 async def delete_leave_request(
     request_id: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_active_user)
 ):
-    leave_request = db.query(LeaveRequest).filter(LeaveRequest.id == request_id).first()
+    leave_request = await db.get(LeaveRequest, request_id)
     if leave_request is None:
         raise HTTPException(status_code=404, detail="Leave request not found")
     
@@ -353,30 +466,34 @@ async def delete_leave_request(
     if leave_request.status != "pending":
         raise HTTPException(status_code=400, detail="Can only delete pending requests")
     
-    db.delete(leave_request)
-    db.commit()
+    await db.delete(leave_request)
+    await db.commit()
     return {"message": "Leave request deleted successfully"}
 
 @router.get("/entitled/overtime", response_model=dict, summary="Get Overtime-based Leave Entitlement", description="Get your total leave days entitled from approved overtime for the current year.")
 async def get_overtime_leave_entitlement(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(get_current_active_user_id)
 ):
     current_year = datetime.now().year
-    total_ot_leave = db.query(func.coalesce(func.sum(OvertimeLeave.leave_days), 0)).filter(
-        OvertimeLeave.user_id == current_user.id,
-        OvertimeLeave.year == current_year
-    ).scalar()
+    async def load():
+        return float(await db.scalar(select(func.coalesce(func.sum(OvertimeLeave.leave_days), 0)).where(
+            OvertimeLeave.user_id == current_user_id,
+            OvertimeLeave.year == current_year
+        )))
+    total_ot_leave = await get_or_load_shared(
+        overtime_leave_cache, (current_user_id, current_year),
+        overtime_leave_key(current_user_id, current_year), _OT_DAYS_ADAPTER, load
+    )
     return {
-        "user_id": current_user.id,
+        "user_id": current_user_id,
         "year": current_year,
         "entitled_leave_days": total_ot_leave
     }
 
 @router.get("/get_eligible_leaves", response_model=List[str], summary="Get Eligible Leave Types", description="Get a list of leave types the current user is eligible for.")
 async def get_eligible_leave_types(
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    eligible_types = [lt for lt in ALLOWED_LEAVE_TYPES if is_leave_type_eligible(current_user, lt)]
-    return eligible_types
+    # Pure function of the user's profile: no query beyond loading the current user
+    return list(eligible_leave_types(current_user, ALLOWED_LEAVE_TYPES))
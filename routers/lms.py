@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import extract
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select, and_, cast, String, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 
-from database import get_db
-from models import Course, Enrollment, Completion, User
+from database import get_async_db, release_connection
+from config import MAX_PAGE_SIZE
+from models import Course, Enrollment, Completion, User, DepartmentEnum
 from schemas import (
     CourseCreate,
     CourseResponse,
@@ -19,21 +22,51 @@ from schemas import (
     DepartmentCoursesResponse
 )
 from auth import get_current_active_user, get_current_user
+from utils import utc_today
 
 router = APIRouter()
 
 DEPT_CATEGORY_MAP = {
-    "ENGINEERING": ["TECH", "HR"],
-    "MARKETING": ["MARKETING", "HR"],
-    "FINANCE": ["FINANCE", "HR"],
-    "HUMAN_RESOURCES": ["HR"],
+    "ENGINEERING": ("TECH", "HR"),
+    "MARKETING": ("MARKETING", "HR"),
+    "FINANCE": ("FINANCE", "HR"),
+    "HUMAN_RESOURCES": ("HR",),
 }
 
+def _allowed_categories(department: DepartmentEnum) -> tuple:
+    """
+    Course categories visible to a department
+    """
+    return DEPT_CATEGORY_MAP.get(department.value, ("HR",))
+
+# The category filter is one expanding bind parameter, so the listing statements compile to the
+# same cache key for every department and only the bound tuple changes
+_IN_ALLOWED_CATEGORIES = Course.category.in_(bindparam("allowed_categories", expanding=True))
+
+# Course listings are read-only: they select plain columns (duration_str computed in SQL the same way
+# as Course.duration_str) so rows skip the identity map, and encode straight to JSON bytes instead of
+# being validated again through response_model
+_COURSE_COLUMNS = (*Course.__table__.c, (cast(Course.duration_days, String) + " days").label("duration_str"))
+_COURSES_ADAPTER = TypeAdapter(List[CourseResponse])
+_ENROLLMENTS_ADAPTER = TypeAdapter(List[EnrollmentResponse])
+_COMPLETIONS_ADAPTER = TypeAdapter(List[CompletionResponse])
+
+def _list_response(adapter: TypeAdapter, rows) -> Response:
+    items = adapter.validate_python(rows, from_attributes=True)
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
+def _department_courses_response(rows, allowed_categories: tuple) -> Response:
+    # One pass: department_categories is filled in during validation from the shared context
+    context = {"department_categories": list(allowed_categories)}
+    courses = [CourseResponse.model_validate(row, context=context) for row in rows]
+    payload = DepartmentCoursesResponse(categories=allowed_categories, courses=courses)
+    return Response(content=payload.model_dump_json(), media_type="application/json")
+
 # Course endpoints
 @router.post("/courses", response_model=CourseResponse)
-def create_course(
+async def create_course(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     course_in: CourseCreate,
     current_user = Depends(get_current_user)
 ):
@@ -42,14 +75,13 @@ def create_course(
     """
     db_course = Course(**course_in.model_dump())
     db.add(db_course)
-    db.commit()
-    db.refresh(db_course)
+    await db.commit()
     return db_course
 
 @router.get("/courses", response_model=DepartmentCoursesResponse)
-def get_courses(
+async def get_courses(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     category: Optional[str] = None,
     instructor: Optional[str] = None,
     is_active: Optional[bool] = None,
@@ -58,91 +90,83 @@ def get_courses(
     """
     Get all courses with optional filtering, filtered by department categories.
     """
-    allowed_categories = DEPT_CATEGORY_MAP.get(current_user.department.value, ["HR"])
-    query = db.query(Course).filter(Course.category.in_(allowed_categories))
+    allowed_categories = _allowed_categories(current_user.department)
+    query = select(*_COURSE_COLUMNS).where(_IN_ALLOWED_CATEGORIES)
     if category:
-        query = query.filter(Course.category == category)
+        query = query.where(Course.category == category)
     if instructor:
-        query = query.filter(Course.instructor == instructor)
+        query = query.where(Course.instructor == instructor)
     if is_active is not None:
-        query = query.filter(Course.is_active == is_active)
-    courses = query.all()
-    course_responses = [CourseResponse.from_orm(course) for course in courses]
-    for course_response in course_responses:
-        course_response.department_categories = allowed_categories
-    return DepartmentCoursesResponse(categories=allowed_categories, courses=course_responses)
+        query = query.where(Course.is_active == is_active)
+    rows = (await db.execute(query, {"allowed_categories": allowed_categories})).all()
+    return _department_courses_response(rows, allowed_categories)
 
 @router.get("/courses/upcoming", response_model=DepartmentCoursesResponse)
-def get_upcoming_courses(
+async def get_upcoming_courses(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    today: date = Depends(utc_today),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get all upcoming (future) active courses, sorted by start_date ascending, filtered by department categories.
     """
-    today = datetime.utcnow().date()
-    allowed_categories = DEPT_CATEGORY_MAP.get(current_user.department.value, ["HR"])
-    courses = db.query(Course).filter(
+    allowed_categories = _allowed_categories(current_user.department)
+    rows = (await db.execute(select(*_COURSE_COLUMNS).where(
         Course.is_active == True,
         Course.start_date > today,
-        Course.category.in_(allowed_categories)
-    ).order_by(Course.start_date.asc()).all()
-    course_responses = [CourseResponse.from_orm(course) for course in courses]
-    for course_response in course_responses:
-        course_response.department_categories = allowed_categories
-    return DepartmentCoursesResponse(categories=allowed_categories, courses=course_responses)
+        _IN_ALLOWED_CATEGORIES
+    ).order_by(Course.start_date.asc()), {"allowed_categories": allowed_categories})).all()
+    return _department_courses_response(rows, allowed_categories)
 
 @router.get("/courses/all", response_model=List[CourseResponse])
-def get_all_courses(
-    db: Session = Depends(get_db),
+async def get_all_courses(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get all courses (admin/manager view, no department/category filtering).
     """
-    return db.query(Course).all()
+    rows = (await db.execute(select(*_COURSE_COLUMNS))).all()
+    await release_connection(db)
+    return _list_response(_COURSES_ADAPTER, rows)
 
 @router.get("/courses/ongoing", response_model=DepartmentCoursesResponse)
-def get_ongoing_courses(
-    db: Session = Depends(get_db),
+async def get_ongoing_courses(
+    db: AsyncSession = Depends(get_async_db),
+    today: date = Depends(utc_today),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get all ongoing courses available to the current user (filtered by department/category),
     where the user is not already enrolled and has not completed.
     """
-    from datetime import date
-    today = date.today()
-    allowed_categories = DEPT_CATEGORY_MAP.get(current_user.department.value, ["HR"])
+    allowed_categories = _allowed_categories(current_user.department)
     # Get all ongoing courses in allowed categories
-    ongoing_courses = db.query(Course).filter(
+    ongoing_courses = (await db.execute(select(*_COURSE_COLUMNS).where(
         Course.is_active == True,
         Course.start_date <= today,
         Course.end_date >= today,
-        Course.category.in_(allowed_categories)
-    ).all()
+        _IN_ALLOWED_CATEGORIES
+    ), {"allowed_categories": allowed_categories})).all()
     # Get user's enrollments and completions
-    enrolled_course_ids = {e.course_id for e in db.query(Enrollment).filter(Enrollment.user_id == current_user.id).all()}
-    completed_course_ids = {c.course_id for c in db.query(Completion).filter(Completion.user_id == current_user.id).all()}
+    enrolled_course_ids = set(await db.scalars(select(Enrollment.course_id).where(Enrollment.user_id == current_user.id)))
+    completed_course_ids = set(await db.scalars(select(Completion.course_id).where(Completion.user_id == current_user.id)))
     # Filter out courses where user is already enrolled or completed
     available_courses = [c for c in ongoing_courses if c.course_id not in enrolled_course_ids and c.course_id not in completed_course_ids]
-    course_responses = [CourseResponse.from_orm(course) for course in available_courses]
-    for course_response in course_responses:
-        course_response.department_categories = allowed_categories
-    return DepartmentCoursesResponse(categories=allowed_categories, courses=course_responses)
+    return _department_courses_response(available_courses, allowed_categories)
 
 @router.get("/courses/{course_id}", response_model=CourseResponse)
-def get_course(
+async def get_course(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     course_id: int,
     current_user = Depends(get_current_user)
 ):
     """
     Get a specific course by ID.
     """
-    course = db.query(Course).filter(Course.course_id == course_id).first()
+    course = await db.get(Course, course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     return course
@@ -150,47 +174,52 @@ def get_course(
 
 # Enrollment endpoints
 @router.post("/enrollments", response_model=EnrollmentResponse)
-def create_enrollment(
+async def create_enrollment(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     enrollment_in: EnrollmentCreate,
+    today: date = Depends(utc_today),
     current_user = Depends(get_current_user)
 ):
     """
     Enroll in a course.
     """
-    # Check if course exists
-    course = db.query(Course).filter(Course.course_id == enrollment_in.course_id).first()
-    if not course:
+    # One round trip: the course plus whether the user is already enrolled in it
+    row = (await db.execute(
+        select(
+            Course,
+            select(Enrollment.enrollment_id).where(
+                Enrollment.user_id == current_user.id,
+                Enrollment.course_id == Course.course_id
+            ).exists().label("enrolled")
+        ).where(Course.course_id == enrollment_in.course_id)
+    )).one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="Course not found")
+    course = row.Course
     
-    today = datetime.utcnow().date()
     # Only allow enrollment for ongoing or upcoming courses
     if course.end_date < today:
         raise HTTPException(status_code=400, detail="Cannot enroll in a course that has already ended.")
-    # Check if already enrolled
-    existing_enrollment = db.query(Enrollment).filter(
-        Enrollment.user_id == current_user.id,
-        Enrollment.course_id == enrollment_in.course_id
-    ).first()
-    if existing_enrollment:
+    if row.enrolled:
         raise HTTPException(status_code=400, detail="Already enrolled in this course")
     
     db_enrollment = Enrollment(
         user_id=current_user.id,
         **enrollment_in.model_dump(),
         status='active',
-        progress=0
+        progress=0,
+        # Set the loaded course so serializing the response never lazy-loads it
+        course=course
     )
     db.add(db_enrollment)
-    db.commit()
-    db.refresh(db_enrollment)
+    await db.commit()
     return db_enrollment
 
 @router.get("/enrollments", response_model=List[EnrollmentResponse])
-def get_enrollments(
+async def get_enrollments(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     year: Optional[int] = None,
     status: Optional[str] = None,
     course_id: Optional[int] = None,
@@ -201,79 +230,76 @@ def get_enrollments(
     """
     Get user's enrollments with optional filtering, including course details.
     """
-    query = db.query(Enrollment).filter(Enrollment.user_id == current_user.id)
+    query = select(Enrollment).where(Enrollment.user_id == current_user.id)
     if year:
-        query = query.filter(extract('year', Enrollment.enrolled_at) == year)
+        query = query.where(Enrollment.enrolled_at >= datetime(year, 1, 1), Enrollment.enrolled_at < datetime(year + 1, 1, 1))
     if status:
-        query = query.filter(Enrollment.status == status)
+        query = query.where(Enrollment.status == status)
     if course_id:
-        query = query.filter(Enrollment.course_id == course_id)
-    enrollments = query.offset(skip).limit(limit).all()
-    # Attach course details
-    result = []
-    for e in enrollments:
-        course = db.query(Course).filter(Course.course_id == e.course_id).first()
-        e_dict = e.__dict__.copy()
-        if course:
-            e_dict['course'] = CourseResponse.from_orm(course)
-        else:
-            e_dict['course'] = None
-        # Remove SQLAlchemy state if present
-        e_dict.pop('_sa_instance_state', None)
-        result.append(EnrollmentResponse(**e_dict))
-    return result
+        query = query.where(Enrollment.course_id == course_id)
+    # Course details come from one IN query for the whole page instead of a lookup per row
+    query = query.options(selectinload(Enrollment.course))
+    enrollments = (await db.scalars(query.offset(skip).limit(min(limit, MAX_PAGE_SIZE)))).all()
+    await release_connection(db)
+    return _list_response(_ENROLLMENTS_ADAPTER, enrollments)
 
 # Completion endpoints
 @router.post("/completions", response_model=CompletionResponse)
-def create_completion(
+async def create_completion(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     completion_in: CompletionCreate,
+    today: date = Depends(utc_today),
     current_user = Depends(get_current_user)
 ):
     """
     Mark a course as completed.
     """
-    # Check if course exists
-    course = db.query(Course).filter(Course.course_id == completion_in.course_id).first()
-    if not course:
+    # One round trip: the course, the user's enrollment in it (if any) and whether it is already completed
+    row = (await db.execute(
+        select(
+            Course,
+            Enrollment,
+            select(Completion.completion_id).where(
+                Completion.user_id == current_user.id,
+                Completion.course_id == Course.course_id
+            ).exists().label("completed")
+        )
+        .outerjoin(Enrollment, and_(
+            Enrollment.course_id == Course.course_id,
+            Enrollment.user_id == current_user.id
+        ))
+        .where(Course.course_id == completion_in.course_id)
+        .limit(1)
+    )).one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="Course not found")
+    course, enrollment = row.Course, row.Enrollment
     
-    today = datetime.utcnow().date()
     # Only allow completion if course has started
     if course.start_date > today:
         raise HTTPException(status_code=400, detail="Cannot complete a course that has not started yet.")
-    # Check if enrolled
-    enrollment = db.query(Enrollment).filter(
-        Enrollment.user_id == current_user.id,
-        Enrollment.course_id == completion_in.course_id
-    ).first()
     if not enrollment:
         raise HTTPException(status_code=400, detail="Not enrolled in this course")
-    # Check if already completed
-    existing_completion = db.query(Completion).filter(
-        Completion.user_id == current_user.id,
-        Completion.course_id == completion_in.course_id
-    ).first()
-    if existing_completion:
+    if row.completed:
         raise HTTPException(status_code=400, detail="Course already completed")
     # Create completion record
     db_completion = Completion(
         user_id=current_user.id,
-        **completion_in.model_dump()
+        **completion_in.model_dump(),
+        course=course
     )
     db.add(db_completion)
     # Update enrollment status
     enrollment.status = 'completed'
     enrollment.progress = 100
-    db.commit()
-    db.refresh(db_completion)
+    await db.commit()
     return db_completion
 
 @router.get("/completions", response_model=List[CompletionResponse])
-def get_completions(
+async def get_completions(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     year: Optional[int] = None,
     course_id: Optional[int] = None,
     skip: int = 0,
@@ -283,21 +309,12 @@ def get_completions(
     """
     Get user's completed courses with optional filtering, including course details.
     """
-    query = db.query(Completion).filter(Completion.user_id == current_user.id)
+    query = select(Completion).where(Completion.user_id == current_user.id)
     if year:
-        query = query.filter(extract('year', Completion.completed_at) == year)
+        query = query.where(Completion.completed_at >= datetime(year, 1, 1), Completion.completed_at < datetime(year + 1, 1, 1))
     if course_id:
-        query = query.filter(Completion.course_id == course_id)
-    completions = query.offset(skip).limit(limit).all()
-    # Attach course details
-    result = []
-    for c in completions:
-        course = db.query(Course).filter(Course.course_id == c.course_id).first()
-        c_dict = c.__dict__.copy()
-        if course:
-            c_dict['course'] = CourseResponse.from_orm(course)
-        else:
-            c_dict['course'] = None
-        c_dict.pop('_sa_instance_state', None)
-        result.append(CompletionResponse(**c_dict))
-    return result 
\ No newline at end of file
+        query = query.where(Completion.course_id == course_id)
+    query = query.options(selectinload(Completion.course))
+    completions = (await db.scalars(query.offset(skip).limit(min(limit, MAX_PAGE_SIZE)))).all()
+    await release_connection(db)
+    return _list_response(_COMPLETIONS_ADAPTER, completions)
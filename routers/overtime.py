@@ -1,26 +1,63 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload
 from typing import List, Optional
-from datetime import datetime
-from sqlalchemy import extract
-from database import get_db
+from itertools import groupby
+from datetime import date, datetime
+from sqlalchemy import delete, extract, false, select, update
+from database import get_async_db, release_connection
 import models
 import schemas
 from auth import get_current_user
+from utils import is_manager, load_subordinate_ids
 from api_utils.overtime import calculate_overtime_entitlement
 from schemas import OvertimePreviewResponse, OvertimeRequestCreate, OvertimeRequestResponse, AttachmentCreate, AttachmentResponse
 from models import Attachment, OvertimeLeave
 from sqlalchemy.sql import func
+from cache import overtime_leave_cache, invalidate_shared_async, overtime_leave_key
 
 router = APIRouter(
     prefix="/overtime",
     tags=["Overtime Management"]
 )
 
+# Overtime responses never touch relationships; refuse any lazy load instead of silently issuing one per row
+_READ_OPTIONS = (raiseload("*", sql_only=True),)
+
+def _leave_days_granted():
+    # Granted leave days for the outer query's request, fetched alongside it instead of one lookup per row
+    return select(OvertimeLeave.leave_days).where(
+        OvertimeLeave.overtime_request_id == models.OvertimeRequest.id
+    ).limit(1).scalar_subquery().label("leave_days_granted")
+
+def _period_criteria(month: Optional[int], year: Optional[int]) -> list:
+    """
+    Filter overtime dates to a month and/or year. Whenever a year is given this is a half-open date
+    range, which an index on (user_id, date) can seek; only a month without a year still needs EXTRACT.
+    """
+    if year is None:
+        return [extract('month', models.OvertimeRequest.date) == month] if month is not None else []
+    try:
+        if month is None:
+            start, end = date(year, 1, 1), date(year + 1, 1, 1)
+        else:
+            start, end = date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+    except ValueError:
+        # An out-of-range month or year matches nothing, as the EXTRACT comparison did
+        return [false()]
+    return [models.OvertimeRequest.date >= start, models.OvertimeRequest.date < end]
+
+def _overtime_response(req, leave_days_granted: Optional[float] = None, message: Optional[str] = None) -> OvertimeRequestResponse:
+    # pydantic-core copies the columns straight off the ORM row; only the computed extras are set here
+    response = OvertimeRequestResponse.model_validate(req)
+    response.leave_days_granted = leave_days_granted
+    response.message = message
+    return response
+
 @router.post("/preview", response_model=OvertimePreviewResponse, summary="Preview Overtime Entitlement", description="Preview how many leave days this OT request will grant, based on business rules.\n\nMultipliers: Weekday ×1.5, Weekend ×2.\nGrades 1–3: All hours, no cap. Grades 4–5: Max 4 hours/day. Leave = OT hours/8. Max 9 leave days/year.")
 async def preview_overtime_request(
     request: OvertimeRequestCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     # Validation: date cannot be in the future
@@ -31,21 +68,21 @@ async def preview_overtime_request(
             detail="Cannot preview overtime for a future date."
         )
     # Validation: only one OT request per day per user
-    existing = db.query(models.OvertimeRequest).filter(
+    existing_id = await db.scalar(select(models.OvertimeRequest.id).where(
         models.OvertimeRequest.user_id == current_user.id,
         models.OvertimeRequest.date == request.date
-    ).first()
-    if existing:
+    ).limit(1))
+    if existing_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot preview overtime: a request (ID {existing.id}) already exists for this date."
+            detail=f"Cannot preview overtime: a request (ID {existing_id}) already exists for this date."
         )
     # Calculate total approved OT leave days for this year
     year = request.date.year
-    total_ot_leave = db.query(func.coalesce(func.sum(OvertimeLeave.leave_days), 0)).filter(
+    total_ot_leave = await db.scalar(select(func.coalesce(func.sum(OvertimeLeave.leave_days), 0)).where(
         OvertimeLeave.user_id == current_user.id,
         OvertimeLeave.year == year
-    ).scalar()
+    ))
     result = calculate_overtime_entitlement(current_user, request.date, request.hours, current_user.grade, 0)
     new_total = total_ot_leave + result['entitled_leave_days']
     message = result['message']
@@ -64,7 +101,7 @@ async def preview_overtime_request(
 @router.post("/request", response_model=OvertimeRequestResponse, summary="Create Overtime Request", description="Submit a new overtime request. Optionally attach a file. Preview leave entitlement before submitting.")
 async def create_overtime_request(
     request: OvertimeRequestCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     # Validation: date cannot be in the future
@@ -75,21 +112,21 @@ async def create_overtime_request(
             detail="Cannot apply for overtime for a future date."
         )
     # Validation: only one OT request per day per user
-    existing = db.query(models.OvertimeRequest).filter(
+    existing_id = await db.scalar(select(models.OvertimeRequest.id).where(
         models.OvertimeRequest.user_id == current_user.id,
         models.OvertimeRequest.date == request.date
-    ).first()
-    if existing:
+    ).limit(1))
+    if existing_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot apply for overtime: a request (ID {existing.id}) already exists for this date."
+            detail=f"Cannot apply for overtime: a request (ID {existing_id}) already exists for this date."
         )
     # Calculate total approved OT leave days for this year
     year = request.date.year
-    total_ot_leave = db.query(func.coalesce(func.sum(OvertimeLeave.leave_days), 0)).filter(
+    total_ot_leave = await db.scalar(select(func.coalesce(func.sum(OvertimeLeave.leave_days), 0)).where(
         OvertimeLeave.user_id == current_user.id,
         OvertimeLeave.year == year
-    ).scalar()
+    ))
     result = calculate_overtime_entitlement(current_user, request.date, request.hours, current_user.grade, 0)
     new_total = total_ot_leave + result['entitled_leave_days']
     message = result['message']
@@ -107,7 +144,7 @@ async def create_overtime_request(
             file_data=request.attachment.fileData
         )
         db.add(attachment_obj)
-        db.flush()
+        await db.flush()
     db_request = models.OvertimeRequest(
         user_id=current_user.id,
         date=request.date,
@@ -116,120 +153,122 @@ async def create_overtime_request(
         attachment_id=attachment_obj.id if attachment_obj else None
     )
     db.add(db_request)
-    db.commit()
-    db.refresh(db_request)
-    return OvertimeRequestResponse(
-        id=db_request.id,
-        user_id=db_request.user_id,
-        date=db_request.date,
-        hours=db_request.hours,
-        reason=db_request.reason,
-        status=db_request.status,
-        approver_comments=db_request.approver_comments,
-        created_at=db_request.created_at,
-        updated_at=db_request.updated_at,
-        message=message
-    )
+    await db.commit()
+    return _overtime_response(db_request, message=message)
 
 @router.get("/my_requests", response_model=List[OvertimeRequestResponse], summary="Get My Overtime Requests", description="Get your overtime requests with leave days granted for each.")
 async def get_my_overtime_requests(
     month: Optional[int] = None,
     year: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    query = db.query(models.OvertimeRequest).filter(
+    query = select(models.OvertimeRequest, _leave_days_granted()).options(*_READ_OPTIONS).where(
         models.OvertimeRequest.user_id == current_user.id
     )
     if month and year:
-        query = query.filter(
-            extract('month', models.OvertimeRequest.date) == month,
-            extract('year', models.OvertimeRequest.date) == year
-        )
-    requests = query.order_by(models.OvertimeRequest.date.desc()).all()
-
-    responses = []
-    for req in requests:
-        leave = db.query(OvertimeLeave).filter(OvertimeLeave.overtime_request_id == req.id).first()
-        leave_days_granted = leave.leave_days if leave else None
-        responses.append(OvertimeRequestResponse(
-            id=req.id,
-            user_id=req.user_id,
-            date=req.date,
-            hours=req.hours,
-            reason=req.reason,
-            status=req.status,
-            approver_comments=req.approver_comments,
-            created_at=req.created_at,
-            updated_at=req.updated_at,
-            leave_days_granted=leave_days_granted
-        ))
-    return responses
+        query = query.where(*_period_criteria(month, year))
+    rows = (await db.execute(query.order_by(models.OvertimeRequest.date.desc()))).all()
+    await release_connection(db)
+    return [
+        _overtime_response(req, leave_days_granted=leave_days_granted)
+        for req, leave_days_granted in rows
+    ]
 
 @router.get("/all_requests", response_model=List[schemas.UserOvertimeRequests], summary="Get All Overtime Requests for Team", description="Managers: Get all overtime requests for your subordinates, with leave days granted for each.")
 async def get_all_overtime_requests(
     user_id: Optional[int] = None,
     month: Optional[int] = None,
     year: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    team_members = db.query(models.User).filter(
-        models.User.manager_id == current_user.id
-    ).all()
-    if not team_members:
+    if not await db.run_sync(is_manager, current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have any team members"
         )
-    team_member_ids = [member.id for member in team_members]
+    if user_id and user_id not in await load_subordinate_ids(db, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only view overtime requests for your team members"
+        )
+    # One query for the whole team: each request row carries its owner's name and granted leave days
+    query = select(
+        models.User.id, models.User.username, models.User.full_name,
+        models.OvertimeRequest, _leave_days_granted()
+    ).join(
+        models.OvertimeRequest, models.OvertimeRequest.user_id == models.User.id
+    ).options(*_READ_OPTIONS).where(models.User.manager_id == current_user.id)
     if user_id:
-        if user_id not in team_member_ids:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only view overtime requests for your team members"
-            )
-        team_members = [m for m in team_members if m.id == user_id]
+        query = query.where(models.User.id == user_id)
+    query = query.where(*_period_criteria(month, year))
+    rows = (await db.execute(query.order_by(models.User.id, models.OvertimeRequest.date.desc()))).all()
+    await release_connection(db)
     result = []
-    for member in team_members:
-        query = db.query(models.OvertimeRequest).filter(
-            models.OvertimeRequest.user_id == member.id
-        )
-        if month is not None:
-            query = query.filter(extract('month', models.OvertimeRequest.date) == month)
-        if year is not None:
-            query = query.filter(extract('year', models.OvertimeRequest.date) == year)
-        requests = query.order_by(models.OvertimeRequest.date.desc()).all()
-        reqs_with_leave = []
-        for req in requests:
-            leave = db.query(OvertimeLeave).filter(OvertimeLeave.overtime_request_id == req.id).first()
-            leave_days_granted = leave.leave_days if leave else None
-            reqs_with_leave.append(OvertimeRequestResponse(
-                id=req.id,
-                user_id=req.user_id,
-                date=req.date,
-                hours=req.hours,
-                reason=req.reason,
-                status=req.status,
-                approver_comments=req.approver_comments,
-                created_at=req.created_at,
-                updated_at=req.updated_at,
-                leave_days_granted=leave_days_granted
-            ))
-        if reqs_with_leave:
-            result.append({
-                "user_id": member.id,
-                "username": member.username,
-                "full_name": member.full_name,
-                "requests": reqs_with_leave
-            })
+    for member_id, member_rows in groupby(rows, key=lambda row: row.id):
+        member_rows = list(member_rows)
+        result.append({
+            "user_id": member_id,
+            "username": member_rows[0].username,
+            "full_name": member_rows[0].full_name,
+            "requests": [
+                _overtime_response(row.OvertimeRequest, leave_days_granted=row.leave_days_granted)
+                for row in member_rows
+            ]
+        })
     return result
 
+async def _own_pending_request_error(db: AsyncSession, request_id: int, user_id: int, action: str) -> HTTPException:
+    # Only after a guarded write matched nothing: tell a missing request apart from one that is no longer pending
+    request_status = await db.scalar(select(models.OvertimeRequest.status).where(
+        models.OvertimeRequest.id == request_id,
+        models.OvertimeRequest.user_id == user_id
+    ))
+    if request_status is None:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Overtime request not found"
+        )
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Cannot {action} a request that is not pending"
+    )
+
+async def _update_own_pending_request(db: AsyncSession, request_id: int, user_id: int, values: dict) -> models.OvertimeRequest:
+    """
+    Apply values to the caller's own pending request with one UPDATE ... RETURNING; ownership and
+    the pending status are part of the WHERE clause.
+    """
+    if not values:
+        # Nothing to change: still enforce the same checks, then return the row as it is
+        db_request = await db.scalar(select(models.OvertimeRequest).options(*_READ_OPTIONS).where(
+            models.OvertimeRequest.id == request_id,
+            models.OvertimeRequest.user_id == user_id,
+            models.OvertimeRequest.status == "pending"
+        ))
+    else:
+        db_request = (await db.scalars(
+            update(models.OvertimeRequest)
+            .where(
+                models.OvertimeRequest.id == request_id,
+                models.OvertimeRequest.user_id == user_id,
+                models.OvertimeRequest.status == "pending"
+            )
+            .values(**values)
+            .returning(models.OvertimeRequest),
+            execution_options={"synchronize_session": False}
+        )).one_or_none()
+    if db_request is None:
+        raise await _own_pending_request_error(db, request_id, user_id, "update")
+    await db.commit()
+    return db_request
+
 @router.put("/{request_id}", response_model=schemas.OvertimeRequestResponse)
 async def update_overtime_request(
     request_id: int,
     request_update: schemas.OvertimeRequestUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
@@ -237,62 +276,33 @@ async def update_overtime_request(
     Only the request owner can update their request if it's still pending.
     All fields must be provided for a complete update.
     """
-    db_request = db.query(models.OvertimeRequest).filter(
-        models.OvertimeRequest.id == request_id,
-        models.OvertimeRequest.user_id == current_user.id
-    ).first()
-    
-    if not db_request:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Overtime request not found"
-        )
-    
-    if db_request.status != "pending":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot update a request that is not pending"
-        )
-    
-    # Update all fields
-    db_request.date = request_update.date
-    db_request.hours = request_update.hours
-    db_request.reason = request_update.reason
-    
-    db.commit()
-    db.refresh(db_request)
-    
-    return db_request
+    return await _update_own_pending_request(db, request_id, current_user.id, {
+        "date": request_update.date,
+        "hours": request_update.hours,
+        "reason": request_update.reason,
+    })
 
 @router.delete("/{request_id}")
 async def delete_overtime_request(
     request_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
     Delete an overtime request.
     Only the request owner can delete their request if it's still pending.
     """
-    db_request = db.query(models.OvertimeRequest).filter(
-        models.OvertimeRequest.id == request_id,
-        models.OvertimeRequest.user_id == current_user.id
-    ).first()
-    
-    if not db_request:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Overtime request not found"
-        )
-    
-    if db_request.status != "pending":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot delete a request that is not pending"
-        )
-    
-    db.delete(db_request)
-    db.commit()
+    deleted = (await db.execute(
+        delete(models.OvertimeRequest).where(
+            models.OvertimeRequest.id == request_id,
+            models.OvertimeRequest.user_id == current_user.id,
+            models.OvertimeRequest.status == "pending"
+        ),
+        execution_options={"synchronize_session": False}
+    )).rowcount
+    if not deleted:
+        raise await _own_pending_request_error(db, request_id, current_user.id, "delete")
+    await db.commit()
     
     return {"message": "Overtime request deleted successfully"}
 
@@ -300,12 +310,16 @@ async def delete_overtime_request(
 async def approve_overtime_request(
     request_id: int,
     approver_comments: str = Body(None, embed=True),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    db_request = db.query(models.OvertimeRequest).filter(
+    # The owner comes back in the same SELECT, with only the columns the checks and entitlement use
+    db_request = await db.scalar(select(models.OvertimeRequest).options(
+        joinedload(models.OvertimeRequest.user).load_only(models.User.manager_id, models.User.grade),
+        *_READ_OPTIONS
+    ).where(
         models.OvertimeRequest.id == request_id
-    ).first()
+    ))
     if not db_request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -323,10 +337,10 @@ async def approve_overtime_request(
         )
     year = db_request.date.year
     # Get total leave days already granted for this year
-    total_leave_days = db.query(OvertimeLeave).filter(
+    total_leave_days = await db.scalar(select(func.coalesce(func.sum(OvertimeLeave.leave_days), 0)).where(
         OvertimeLeave.user_id == db_request.user_id,
         OvertimeLeave.year == year
-    ).with_entities(func.coalesce(func.sum(OvertimeLeave.leave_days), 0)).scalar()
+    ))
     # Calculate entitlement for this request
     result = calculate_overtime_entitlement(db_request.user, db_request.date, db_request.hours, db_request.user.grade, 0)
     request_leave_days = result['entitled_leave_days']
@@ -335,19 +349,8 @@ async def approve_overtime_request(
     if request_leave_days <= 0:
         db_request.status = "rejected"
         db_request.approver_comments = (approver_comments or "") + "\nAuto-rejected: No entitled leave days for this request."
-        db.commit()
-        db.refresh(db_request)
-        return OvertimeRequestResponse(
-            id=db_request.id,
-            user_id=db_request.user_id,
-            date=db_request.date,
-            hours=db_request.hours,
-            reason=db_request.reason,
-            status=db_request.status,
-            approver_comments=db_request.approver_comments,
-            created_at=db_request.created_at,
-            updated_at=db_request.updated_at
-        )
+        await db.commit()
+        return _overtime_response(db_request)
     # Partial approval logic
     if new_total > 9:
         grantable_days = max(0, 9 - total_leave_days)
@@ -378,19 +381,9 @@ async def approve_overtime_request(
                 (approver_comments or "") +
                 "\nAuto-rejected: Approving this request would exceed the maximum of 9 OT leave days per year. Please contact HR for exceptions. (HR: hr@example.com)"
             )
-        db.commit()
-        db.refresh(db_request)
-        return OvertimeRequestResponse(
-            id=db_request.id,
-            user_id=db_request.user_id,
-            date=db_request.date,
-            hours=db_request.hours,
-            reason=db_request.reason,
-            status=db_request.status,
-            approver_comments=db_request.approver_comments,
-            created_at=db_request.created_at,
-            updated_at=db_request.updated_at
-        )
+        await db.commit()
+        await invalidate_shared_async(overtime_leave_cache, (db_request.user_id, year), overtime_leave_key(db_request.user_id, year))
+        return _overtime_response(db_request)
     # Full approval
     overtime_leave = OvertimeLeave(
         user_id=db_request.user_id,
@@ -402,67 +395,69 @@ async def approve_overtime_request(
     db.add(overtime_leave)
     db_request.status = "approved"
     db_request.approver_comments = (approver_comments or "") + f"\n{result['message']}"
-    db.commit()
-    db.refresh(db_request)
-    return OvertimeRequestResponse(
-        id=db_request.id,
-        user_id=db_request.user_id,
-        date=db_request.date,
-        hours=db_request.hours,
-        reason=db_request.reason,
-        status=db_request.status,
-        approver_comments=db_request.approver_comments,
-        created_at=db_request.created_at,
-        updated_at=db_request.updated_at
-    )
+    await db.commit()
+    await invalidate_shared_async(overtime_leave_cache, (db_request.user_id, year), overtime_leave_key(db_request.user_id, year))
+    return _overtime_response(db_request)
 
 @router.put("/{request_id}/reject", response_model=schemas.OvertimeRequestResponse)
 async def reject_overtime_request(
     request_id: int,
     approver_comments: str = Body(None, embed=True),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
     Reject an overtime request.
     Only managers can reject requests for their subordinates.
     """
-    db_request = db.query(models.OvertimeRequest).filter(
+    # One guarded UPDATE: the request must be pending and belong to one of the caller's direct reports
+    db_request = (await db.scalars(
+        update(models.OvertimeRequest)
+        .where(
+            models.OvertimeRequest.id == request_id,
+            models.OvertimeRequest.status == "pending",
+            models.OvertimeRequest.user_id.in_(
+                select(models.User.id).where(models.User.manager_id == current_user.id)
+            )
+        )
+        .values(status="rejected", approver_comments=approver_comments)
+        .returning(models.OvertimeRequest),
+        execution_options={"synchronize_session": False}
+    )).one_or_none()
+    if db_request is not None:
+        await db.commit()
+        return db_request
+    
+    # Only on failure: work out which guard failed
+    row = (await db.execute(select(models.OvertimeRequest.status, models.User.manager_id).join(
+        models.User, models.User.id == models.OvertimeRequest.user_id
+    ).where(
         models.OvertimeRequest.id == request_id
-    ).first()
+    ))).first()
     
-    if not db_request:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Overtime request not found"
         )
     
     # Verify the current user is the manager of the request's user
-    if db_request.user.manager_id != current_user.id:
+    if row.manager_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only reject overtime requests for your direct subordinates"
         )
     
-    if db_request.status != "pending":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Request is already {db_request.status}"
-        )
-    
-    db_request.status = "rejected"
-    db_request.approver_comments = approver_comments
-    
-    db.commit()
-    db.refresh(db_request)
-    
-    return db_request
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Request is already {row.status}"
+    )
 
 @router.patch("/{request_id}", response_model=schemas.OvertimeRequestResponse)
 async def patch_overtime_request(
     request_id: int,
     request_update: schemas.OvertimeRequestPartialUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """
@@ -470,32 +465,6 @@ async def patch_overtime_request(
     Only the request owner can update their request if it's still pending.
     Only the fields provided in the request will be updated.
     """
-    db_request = db.query(models.OvertimeRequest).filter(
-        models.OvertimeRequest.id == request_id,
-        models.OvertimeRequest.user_id == current_user.id
-    ).first()
-    
-    if not db_request:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Overtime request not found"
-        )
-    
-    if db_request.status != "pending":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot update a request that is not pending"
-        )
-    
-
-    if request_update.date is not None:
-        db_request.date = request_update.date
-    if request_update.hours is not None:
-        db_request.hours = request_update.hours
-    if request_update.reason is not None:
-        db_request.reason = request_update.reason
-    
-    db.commit()
-    db.refresh(db_request)
-    
-    return db_request 
\ No newline at end of file
+    return await _update_own_pending_request(
+        db, request_id, current_user.id, request_update.model_dump(exclude_none=True)
+    )
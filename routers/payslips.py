@@ -21,7 +21,7 @@ class PayslipGenerateRequest(BaseModel):
     year: int
 
 @router.get("/getpayslipperiod")
-async def get_payslip_periods(
+def get_payslip_periods(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -56,7 +56,7 @@ async def get_payslip_periods(
     return periods
 
 @router.post("/generate")
-async def generate_payslip(
+def generate_payslip(
     payload: PayslipGenerateRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -98,12 +98,11 @@ async def generate_payslip(
     
     db.add(payslip)
     db.commit()
-    db.refresh(payslip)
     
     return payslip
 
 @router.get("")
-async def get_payslips(
+def get_payslips(
     year: Optional[int] = Query(None, ge=2000),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -124,7 +123,7 @@ async def get_payslips(
     return payslips
 
 @router.get("/pending", response_model=List[PayslipResponse], summary="Get My Pending Payslips", description="Retrieve all pending payslips for the current user.")
-async def get_my_pending_payslips(
+def get_my_pending_payslips(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -135,7 +134,7 @@ async def get_my_pending_payslips(
     return pending_payslips
 
 @router.get("/get_single")
-async def get_single_payslip(
+def get_single_payslip(
     year: int = Query(..., ge=2000),
     month: int = Query(..., ge=1, le=12),
     current_user: User = Depends(get_current_user),
@@ -151,7 +150,7 @@ async def get_single_payslip(
     return payslip 
 
 @router.get("/{payslip_id}")
-async def get_payslip_details(
+def get_payslip_details(
     payslip_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -169,7 +168,7 @@ async def get_payslip_details(
     return payslip
 
 @router.delete("/{payslip_id}")
-async def delete_payslip(
+def delete_payslip(
     payslip_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -191,7 +190,7 @@ async def delete_payslip(
     return {"message": "Payslip deleted successfully"}
 
 @router.put("/{payslip_id}/approve")
-async def approve_payslip(
+def approve_payslip(
     payslip_id: int,
     approver_comments: str = Body(None, embed=True),
     current_user: User = Depends(get_current_user),
@@ -209,11 +208,10 @@ async def approve_payslip(
     payslip.approved_at = datetime.now()
     payslip.approver_comments = approver_comments
     db.commit()
-    db.refresh(payslip)
     return payslip
 
 @router.put("/{payslip_id}/reject")
-async def reject_payslip(
+def reject_payslip(
     payslip_id: int,
     approver_comments: str = Body(None, embed=True),
     current_user: User = Depends(get_current_user),
@@ -231,5 +229,4 @@ async def reject_payslip(
     payslip.approved_at = datetime.now()
     payslip.approver_comments = approver_comments
     db.commit()
-    db.refresh(payslip)
     return payslip 
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from typing import List, Optional
 from datetime import datetime
 from sqlalchemy import extract
@@ -16,7 +16,7 @@ router = APIRouter(
 
 # Goal Management Endpoints
 @router.post("/goals", response_model=schemas.PerformanceGoal)
-async def create_goal(
+def create_goal(
     goal: schemas.PerformanceGoalCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
@@ -50,12 +50,11 @@ async def create_goal(
     
     db.add(db_goal)
     db.commit()
-    db.refresh(db_goal)
     
     return db_goal
 
 @router.get("/goals", response_model=List[schemas.GoalResponse])
-async def get_my_goals(
+def get_my_goals(
     year: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
@@ -73,7 +72,7 @@ async def get_my_goals(
     return goals
 
 @router.get("/goals/all", response_model=List[schemas.UserGoalsResponse])
-async def get_all_goals(
+def get_all_goals(
     year: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
@@ -91,7 +90,10 @@ async def get_all_goals(
     if year is None:
         year = datetime.now().year
     # Get all users who report to this manager
-    team_members = db.query(models.User).filter(
+    # Only the columns the response uses, not the full profile row
+    team_members = db.query(models.User).options(
+        load_only(models.User.id, models.User.username, models.User.full_name)
+    ).filter(
         models.User.manager_id == current_user.id
     ).all()
     
@@ -119,7 +121,7 @@ async def get_all_goals(
     return result
 
 @router.put("/goals/{goal_id}", response_model=schemas.PerformanceGoal)
-async def update_goal(
+def update_goal(
     goal_id: int,
     goal_update: schemas.PerformanceGoalUpdate,
     db: Session = Depends(get_db),
@@ -151,12 +153,11 @@ async def update_goal(
         db_goal.progress = goal_update.progress
     
     db.commit()
-    db.refresh(db_goal)
     
     return db_goal
 
 @router.delete("/goals/{goal_id}")
-async def delete_goal(
+def delete_goal(
     goal_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
@@ -186,7 +187,7 @@ async def delete_goal(
 
 # Performance Review Endpoints
 @router.post("/reviews", response_model=schemas.ReviewResponse)
-async def create_self_review(
+def create_self_review(
     review: schemas.ReviewCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
@@ -221,12 +222,11 @@ async def create_self_review(
     
     db.add(db_review)
     db.commit()
-    db.refresh(db_review)
     
     return db_review
 
 @router.get("/reviews/report", response_model=List[schemas.GoalReviewReportItem])
-async def get_performance_review_report(
+def get_performance_review_report(
     user_id: Optional[int] = None,
     year: Optional[int] = None,
     db: Session = Depends(get_db),
@@ -264,7 +264,7 @@ async def get_performance_review_report(
     return report
 
 @router.get("/reviews/all", response_model=List[schemas.ReviewResponse])
-async def get_all_reviews(
+def get_all_reviews(
     year: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
@@ -282,14 +282,12 @@ async def get_all_reviews(
     if year is None:
         year = datetime.now().year
     # Get all users who report to this manager
-    team_members = db.query(models.User).filter(
+    team_member_ids = [member_id for (member_id,) in db.query(models.User.id).filter(
         models.User.manager_id == current_user.id
-    ).all()
+    )]
     
-    if not team_members:
+    if not team_member_ids:
         return []
-    
-    team_member_ids = [member.id for member in team_members]
     reviews = db.query(models.PerformanceReview).filter(
         models.PerformanceReview.user_id.in_(team_member_ids),
         models.PerformanceReview.year == year
@@ -298,7 +296,7 @@ async def get_all_reviews(
     return reviews
 
 @router.get("/reviews/pending", response_model=List[schemas.ReviewResponse])
-async def get_pending_reviews_for_manager(
+def get_pending_reviews_for_manager(
     year: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
@@ -317,15 +315,13 @@ async def get_pending_reviews_for_manager(
         year = datetime.now().year
         
     # Get all users who report to this manager
-    team_members = db.query(models.User).filter(
+    team_member_ids = [member_id for (member_id,) in db.query(models.User.id).filter(
         models.User.manager_id == current_user.id
-    ).all()
+    )]
     
-    if not team_members:
+    if not team_member_ids:
         return []
     
-    team_member_ids = [member.id for member in team_members]
-    
     reviews = db.query(models.PerformanceReview).filter(
         models.PerformanceReview.user_id.in_(team_member_ids),
         models.PerformanceReview.status == "pending",
@@ -372,7 +368,6 @@ def approve_review(
     review.areas_for_improvement = approval.areas_for_improvement
 
     db.commit()
-    db.refresh(review)
     return review
 
 @router.put("/reviews/{review_id}/reject", response_model=schemas.ReviewResponse)
@@ -411,5 +406,4 @@ def reject_review(
     review.approver_comments = rejection.approver_comments
     
     db.commit()
-    db.refresh(review)
     return review 
\ No newline at end of file
@@ -28,7 +28,7 @@ def get_request_details(req, req_type):
         return ""
 
 @router.get("/my-requests", response_model=List[RequestSummary], summary="Get All My Requests", description="Retrieve all requests (leave, bank letter, visa letter, overtime, payslip) for current user")
-async def get_my_all_requests(
+def get_my_all_requests(
     db: Session = Depends(get_db), 
     current_user: User = Depends(get_current_active_user)
 ):
@@ -136,7 +136,7 @@ async def get_my_all_requests(
     return requests
 
 @router.get("/all-requests", response_model=List[RequestSummary], summary="Get All Requests", description="Retrieve all requests from all users (HR/Manager function)")
-async def get_all_requests(
+def get_all_requests(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db), 
@@ -254,7 +254,7 @@ async def get_all_requests(
     return requests
 
 @router.get("/pending", response_model=List[RequestSummary], summary="Get Pending Requests", description="Retrieve all pending requests for approval (HR/Manager function)")
-async def get_pending_requests(
+def get_pending_requests(
     db: Session = Depends(get_db), 
     current_user: User = Depends(get_current_active_user)
 ):
@@ -12,6 +12,7 @@ from auth import get_current_active_user
 from datetime import datetime
 import logging
 from utils import verify_manager_permission
+from cache import salary_structure_cache, benefits_cache, get_or_load, invalidate
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -19,24 +20,20 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/salary", tags=["Salary and Benefits"])
 
-def is_manager(db: Session, user: User) -> bool:
-    """Check if user is a manager (has subordinates)"""
-    # Check if any user has this user as their manager
-    subordinates = db.query(User).filter(User.manager_id == user.id).first()
-    return subordinates is not None
+def _load_salary_structure(db: Session, user_id: int):
+    salary = db.query(SalaryStructure).filter(SalaryStructure.user_id == user_id).first()
+    return SalaryStructureResponse.model_validate(salary) if salary else None
 
-def is_subordinate(db: Session, manager: User, user_id: int) -> bool:
-    """Check if user_id is a subordinate of the manager"""
-    # Get the target user
-    target_user = db.query(User).filter(User.id == user_id).first()
-    if not target_user:
-        return False
-    # Check if target user's manager is the given manager
-    return target_user.manager_id == manager.id
+def _active_benefits(db: Session) -> List[BenefitResponse]:
+    """Active benefits catalog, cached per worker"""
+    return get_or_load(benefits_cache, "active", lambda: [
+        BenefitResponse.model_validate(benefit)
+        for benefit in db.query(Benefit).filter(Benefit.is_active == True).all()
+    ])
 
 # Salary Structure APIs
 @router.post("/structure", response_model=SalaryStructureResponse)
-async def create_salary_structure(
+def create_salary_structure(
     salary: SalaryStructureCreate,
     user_id: int,
     db: Session = Depends(get_db),
@@ -62,24 +59,24 @@ async def create_salary_structure(
     )
     db.add(db_salary)
     db.commit()
-    db.refresh(db_salary)
+    invalidate(salary_structure_cache, user_id)
     logger.info(f"Successfully created salary structure for user {user_id}")
     return db_salary
 
 @router.get("/structure", response_model=SalaryStructureResponse)
-async def get_my_salary_structure(
+def get_my_salary_structure(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     logger.info(f"User {current_user.id} requesting their salary structure")
-    salary = db.query(SalaryStructure).filter(SalaryStructure.user_id == current_user.id).first()
+    salary = get_or_load(salary_structure_cache, current_user.id, lambda: _load_salary_structure(db, current_user.id))
     if not salary:
         logger.warning(f"Salary structure not found for user {current_user.id}")
         raise HTTPException(status_code=404, detail="Salary structure not found")
     return salary
 
 @router.get("/structure/{user_id}", response_model=SalaryStructureResponse)
-async def get_user_salary_structure(
+def get_user_salary_structure(
     user_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -89,14 +86,14 @@ async def get_user_salary_structure(
     # Verify manager permissions
     verify_manager_permission(db, current_user, user_id)
     
-    salary = db.query(SalaryStructure).filter(SalaryStructure.user_id == user_id).first()
+    salary = get_or_load(salary_structure_cache, user_id, lambda: _load_salary_structure(db, user_id))
     if not salary:
         logger.warning(f"Salary structure not found for user {user_id}")
         raise HTTPException(status_code=404, detail="Salary structure not found")
     return salary
 
 @router.put("/structure/{user_id}", response_model=SalaryStructureResponse)
-async def update_salary_structure(
+def update_salary_structure(
     user_id: int,
     salary: SalaryStructureUpdate,
     db: Session = Depends(get_db),
@@ -116,37 +113,35 @@ async def update_salary_structure(
         setattr(db_salary, key, value)
     
     db.commit()
-    db.refresh(db_salary)
+    invalidate(salary_structure_cache, user_id)
     logger.info(f"Successfully updated salary structure for user {user_id}")
     return db_salary
 
 # Benefits APIs
 @router.get("/benefits", response_model=List[BenefitResponse])
-async def list_benefits(
+def list_benefits(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    benefits = db.query(Benefit).filter(Benefit.is_active == True).all()
-    return benefits
+    return _active_benefits(db)
 
 
 @router.get("/benefits/gradewise")
-async def list_benefits_gradewise(
+def list_benefits_gradewise(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """List all benefits grouped by grade."""
-    benefits = db.query(Benefit).filter(Benefit.is_active == True).all()
     gradewise = {}
-    for benefit in benefits:
+    for benefit in _active_benefits(db):
         if benefit.grades:
             for grade in benefit.grades:
-                gradewise.setdefault(grade, []).append(BenefitResponse.model_validate(benefit))
+                gradewise.setdefault(grade, []).append(benefit)
     gradewise = dict(sorted(gradewise.items(), key=lambda x: x[0]))
     return gradewise
 
 @router.post("/benefits/enroll", response_model=BenefitEnrollmentResponse)
-async def enroll_in_benefit(
+def enroll_in_benefit(
     enrollment: BenefitEnrollmentCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -175,11 +170,10 @@ async def enroll_in_benefit(
     )
     db.add(db_enrollment)
     db.commit()
-    db.refresh(db_enrollment)
     return db_enrollment
 
 @router.get("/benefits/enrollments", response_model=List[BenefitEnrollmentResponse])
-async def get_my_enrollments(
+def get_my_enrollments(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -189,7 +183,7 @@ async def get_my_enrollments(
     return enrollments
 
 @router.get("/benefits/my-active-benefits", response_model=List[BenefitResponse])
-async def get_my_active_benefits(
+def get_my_active_benefits(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -208,7 +202,7 @@ async def get_my_active_benefits(
     return benefits
 
 @router.get("/benefits/user-active-benefits/{user_id}", response_model=List[BenefitResponse])
-async def get_user_active_benefits(
+def get_user_active_benefits(
     user_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -217,7 +211,8 @@ async def get_user_active_benefits(
     # Verify manager permissions
     verify_manager_permission(db, current_user, user_id)
     # Get the target user and their grade
-    target_user = db.query(User).filter(User.id == user_id).first()
+    # Only the grade is needed from the target user's row
+    target_user = db.query(User.grade).filter(User.id == user_id).first()
     if not target_user:
         raise HTTPException(status_code=404, detail="User not found")
     user_grade = str(target_user.grade)
@@ -234,7 +229,7 @@ async def get_user_active_benefits(
     return benefits
 
 @router.put("/benefits/enrollments/{enrollment_id}/approve", response_model=BenefitEnrollmentResponse)
-async def approve_enrollment(
+def approve_enrollment(
     enrollment_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -254,11 +249,10 @@ async def approve_enrollment(
     enrollment.approved_at = datetime.now()
     
     db.commit()
-    db.refresh(enrollment)
     return enrollment
 
 @router.put("/benefits/enrollments/{enrollment_id}/reject", response_model=BenefitEnrollmentResponse)
-async def reject_enrollment(
+def reject_enrollment(
     enrollment_id: int,
     rejection: BenefitEnrollmentUpdate,
     db: Session = Depends(get_db),
@@ -280,5 +274,4 @@ async def reject_enrollment(
     enrollment.rejection_reason = rejection.rejection_reason
     
     db.commit()
-    db.refresh(enrollment)
     return enrollment 
\ No newline at end of file
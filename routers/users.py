@@ -8,24 +8,22 @@ from auth import get_password_hash, get_current_active_user, get_current_user
 from datetime import datetime
 from routers.leave import DEFAULT_LEAVE_BALANCES
 from api_utils.leave import is_leave_type_eligible
+from cache import leave_balance_cache, auth_user_cache, manager_cache, team_cache, invalidate, invalidate_shared, clear, leave_balance_key, team_key
 
 router = APIRouter(prefix="/users", tags=["User Management"])
 
 @router.post("/", response_model=UserResponse, summary="Create User", description="Create a new user account")
-async def create_user(user: UserCreate, db: Session = Depends(get_db)):
+def create_user(user: UserCreate, db: Session = Depends(get_db)):
     # Check if username already exists
-    db_user = db.query(User).filter(User.username == user.username).first()
-    if db_user:
+    if db.query(User.id).filter(User.username == user.username).first():
         raise HTTPException(status_code=400, detail="Username already registered")
     
     # Check if email already exists
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
+    if db.query(User.id).filter(User.email == user.email).first():
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Check if employee_id already exists
-    db_user = db.query(User).filter(User.employee_id == user.employee_id).first()
-    if db_user:
+    if db.query(User.id).filter(User.employee_id == user.employee_id).first():
         raise HTTPException(status_code=400, detail="Employee ID already registered")
     
     # Create new user
@@ -56,7 +54,10 @@ async def create_user(user: UserCreate, db: Session = Depends(get_db)):
     )
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
+    if db_user.manager_id is not None:
+        # The manager may have just gained their first direct report
+        invalidate(manager_cache, db_user.manager_id)
+        invalidate_shared(team_cache, db_user.manager_id, team_key(db_user.manager_id))
 
 
     current_year = datetime.now().year
@@ -72,23 +73,24 @@ async def create_user(user: UserCreate, db: Session = Depends(get_db)):
             )
             db.add(leave_balance)
     db.commit()
+    invalidate_shared(leave_balance_cache, db_user.id, leave_balance_key(db_user.id))
 
     return db_user
 
 @router.get("/", response_model=List[UserResponse], summary="Get All Users", description="Retrieve all users (admin function)")
-async def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
     users = db.query(User).offset(skip).limit(limit).all()
     return users
 
 @router.get("/{user_id}", response_model=UserResponse, summary="Get User by ID", description="Retrieve a specific user by ID")
-async def read_user(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+def read_user(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 @router.get("/subordinates/", response_model=List[UserResponse], summary="Get a list of direct subordinates")
-async def get_subordinates(
+def get_subordinates(
     current_user: User = Depends(get_current_user), 
     db: Session = Depends(get_db)
 ):
@@ -103,18 +105,22 @@ async def get_subordinates(
             detail="You don't have any subordinates"
         )
         
-    # Patch: convert department enum to value for each subordinate
-    for s in subordinates:
-        if hasattr(s, "department") and hasattr(s.department, "value"):
-            s.department = s.department.value
     return subordinates
 
 @router.delete("/{user_id}", response_model=MessageResponse, summary="Delete User", description="Delete a user account")
-async def delete_user(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+def delete_user(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     
     db.delete(user)
     db.commit()
+    # Tokens are cached by signature, not user id, so drop them all rather than wait for the TTL
+    clear(auth_user_cache)
+    invalidate(manager_cache, user.id)
+    invalidate_shared(team_cache, user.id, team_key(user.id))
+    if user.manager_id is not None:
+        # The manager may have just lost their last direct report
+        invalidate(manager_cache, user.manager_id)
+        invalidate_shared(team_cache, user.manager_id, team_key(user.manager_id))
     return {"message": f"User {user.username} deleted successfully"} 
\ No newline at end of file
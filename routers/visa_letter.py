@@ -1,6 +1,7 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session, selectinload
 from database import get_db
 from models import User, VisaLetterRequest, Attachment
 from schemas import VisaLetterRequestCreate, VisaLetterRequestResponse, VisaLetterRequestUpdate, MessageResponse
@@ -9,7 +10,7 @@ from auth import get_current_active_user
 router = APIRouter(prefix="/visa-letter", tags=["Visa Letter Requests"])
 
 @router.post("/", response_model=VisaLetterRequestResponse, summary="Request Visa Letter", description="Submit a new visa letter request with attachments")
-async def request_visa_letter(
+def request_visa_letter(
     visa_letter_request: VisaLetterRequestCreate, 
     db: Session = Depends(get_db), 
     current_user: User = Depends(get_current_active_user)
@@ -26,23 +27,24 @@ async def request_visa_letter(
     db.add(db_visa_letter_request)
     db.flush()  # Get the ID
     
-    # Create attachments
-    for attachment_data in visa_letter_request.attachments:
-        attachment = Attachment(
-            file_name=attachment_data.fileName,
-            file_type=attachment_data.fileType,
-            file_desc=attachment_data.fileDesc,
-            file_data=attachment_data.fileData,
-            visa_letter_request_id=db_visa_letter_request.id
-        )
-        db.add(attachment)
+    # Create attachments in a single executemany INSERT
+    if visa_letter_request.attachments:
+        db.execute(insert(Attachment), [
+            {
+                "file_name": attachment_data.fileName,
+                "file_type": attachment_data.fileType,
+                "file_desc": attachment_data.fileDesc,
+                "file_data": attachment_data.fileData,
+                "visa_letter_request_id": db_visa_letter_request.id
+            }
+            for attachment_data in visa_letter_request.attachments
+        ])
     
     db.commit()
-    db.refresh(db_visa_letter_request)
     return db_visa_letter_request
 
 @router.get("/", response_model=List[VisaLetterRequestResponse], summary="Get My Visa Letter Requests", description="Retrieve all visa letter requests for current user")
-async def get_my_visa_letter_requests(
+def get_my_visa_letter_requests(
     db: Session = Depends(get_db), 
     current_user: User = Depends(get_current_active_user)
 ):
@@ -50,7 +52,7 @@ async def get_my_visa_letter_requests(
     return visa_letter_requests
 
 @router.get("/all", response_model=List[VisaLetterRequestResponse], summary="Get All Visa Letter Requests", description="Retrieve all visa letter requests (HR function)")
-async def get_all_visa_letter_requests(
+def get_all_visa_letter_requests(
     skip: int = 0, 
     limit: int = 100, 
     db: Session = Depends(get_db), 
@@ -60,12 +62,14 @@ async def get_all_visa_letter_requests(
     return visa_letter_requests
 
 @router.get("/{request_id}", response_model=VisaLetterRequestResponse, summary="Get Visa Letter Request by ID", description="Retrieve a specific visa letter request by ID")
-async def get_visa_letter_request(
+def get_visa_letter_request(
     request_id: int, 
     db: Session = Depends(get_db), 
     current_user: User = Depends(get_current_active_user)
 ):
-    visa_letter_request = db.query(VisaLetterRequest).filter(VisaLetterRequest.id == request_id).first()
+    visa_letter_request = db.query(VisaLetterRequest).options(
+        selectinload(VisaLetterRequest.attachments).undefer(Attachment.file_data)
+    ).filter(VisaLetterRequest.id == request_id).first()
     if visa_letter_request is None:
         raise HTTPException(status_code=404, detail="Visa letter request not found")
     
@@ -76,26 +80,31 @@ async def get_visa_letter_request(
     
     return visa_letter_request
 
+def _set_visa_letter_status(db: Session, request_id: int, new_status: str, approver_comments: Optional[str]) -> VisaLetterRequest:
+    # Single UPDATE ... RETURNING instead of a SELECT followed by a flushed UPDATE
+    visa_letter_request = db.scalars(
+        update(VisaLetterRequest)
+        .where(VisaLetterRequest.id == request_id)
+        .values(status=new_status, approver_comments=approver_comments)
+        .returning(VisaLetterRequest),
+        execution_options={"synchronize_session": False}
+    ).one_or_none()
+    if visa_letter_request is None:
+        raise HTTPException(status_code=404, detail="Visa letter request not found")
+    db.commit()
+    return visa_letter_request
+
 @router.put("/{request_id}", response_model=VisaLetterRequestResponse, summary="Update Visa Letter Request Status", description="Approve/reject a visa letter request (HR function)")
-async def update_visa_letter_request(
+def update_visa_letter_request(
     request_id: int, 
     update_data: VisaLetterRequestUpdate, 
     db: Session = Depends(get_db), 
     current_user: User = Depends(get_current_active_user)
 ):
-    visa_letter_request = db.query(VisaLetterRequest).filter(VisaLetterRequest.id == request_id).first()
-    if visa_letter_request is None:
-        raise HTTPException(status_code=404, detail="Visa letter request not found")
-    
-    visa_letter_request.status = update_data.status
-    visa_letter_request.approver_comments = update_data.approver_comments
-    
-    db.commit()
-    db.refresh(visa_letter_request)
-    return visa_letter_request
+    return _set_visa_letter_status(db, request_id, update_data.status, update_data.approver_comments)
 
 @router.delete("/{request_id}", response_model=MessageResponse, summary="Delete Visa Letter Request", description="Delete a visa letter request (only if pending)")
-async def delete_visa_letter_request(
+def delete_visa_letter_request(
     request_id: int, 
     db: Session = Depends(get_db), 
     current_user: User = Depends(get_current_active_user)
@@ -116,33 +125,19 @@ async def delete_visa_letter_request(
     return {"message": "Visa letter request deleted successfully"}
 
 @router.put("/{request_id}/approve", response_model=VisaLetterRequestResponse)
-async def approve_visa_letter_request(
+def approve_visa_letter_request(
     request_id: int,
     approver_comments: str = Body(None, embed=True),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    visa_letter_request = db.query(VisaLetterRequest).filter(VisaLetterRequest.id == request_id).first()
-    if visa_letter_request is None:
-        raise HTTPException(status_code=404, detail="Visa letter request not found")
-    visa_letter_request.status = "approved"
-    visa_letter_request.approver_comments = approver_comments
-    db.commit()
-    db.refresh(visa_letter_request)
-    return visa_letter_request
+    return _set_visa_letter_status(db, request_id, "approved", approver_comments)
 
 @router.put("/{request_id}/reject", response_model=VisaLetterRequestResponse)
-async def reject_visa_letter_request(
+def reject_visa_letter_request(
     request_id: int,
     approver_comments: str = Body(None, embed=True),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    visa_letter_request = db.query(VisaLetterRequest).filter(VisaLetterRequest.id == request_id).first()
-    if visa_letter_request is None:
-        raise HTTPException(status_code=404, detail="Visa letter request not found")
-    visa_letter_request.status = "rejected"
-    visa_letter_request.approver_comments = approver_comments
-    db.commit()
-    db.refresh(visa_letter_request)
-    return visa_letter_request 
\ No newline at end of file
+    return _set_visa_letter_status(db, request_id, "rejected", approver_comments) 
\ No newline at end of file
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, EmailStr, Field
+import base64
+from pydantic import BaseModel, EmailStr, Field, ValidationInfo, field_validator, model_validator
+from sqlalchemy import inspect as sa_inspect
 from datetime import datetime, date
 from typing import Optional, List
-from models import CourseCategory
+from models import CourseCategory, RequestStatus
 from enum import Enum as PyEnum
 
 
@@ -89,7 +91,11 @@ class LeaveRequestWithEmployeeResponse(LeaveRequestResponse):
     
 
 class LeaveRequestUpdate(BaseModel):
-    status: str
+    status: RequestStatus
+    approver_comments: Optional[str] = None
+
+class LeaveRequestBulkApprove(BaseModel):
+    request_ids: List[int] = Field(..., min_length=1)
     approver_comments: Optional[str] = None
 
 # Leave Balance Schemas
@@ -115,7 +121,17 @@ class AttachmentBase(BaseModel):
     fileName: str
     fileType: str
     fileDesc: Optional[str] = None
-    fileData: str
+    fileData: bytes  # Sent as base64, stored as raw bytes
+
+    @field_validator("fileData", mode="before")
+    @classmethod
+    def decode_file_data(cls, value):
+        if isinstance(value, str):
+            try:
+                return base64.b64decode(value, validate=True)
+            except ValueError:
+                raise ValueError("fileData must be base64 encoded")
+        return value
 
 class AttachmentCreate(AttachmentBase):
     pass
@@ -125,7 +141,27 @@ class AttachmentResponse(BaseModel):
     file_name: str
     file_type: str
     file_desc: Optional[str] = None
-    file_data: str
+    file_data: Optional[str] = None  # Only included when a single request is fetched
+    
+    @model_validator(mode="before")
+    @classmethod
+    def skip_deferred_file_data(cls, data):
+        # Leave out a blob the query did not load instead of lazy-loading it per attachment
+        if hasattr(data, "_sa_instance_state") and "file_data" in sa_inspect(data).unloaded:
+            return {
+                "id": data.id,
+                "file_name": data.file_name,
+                "file_type": data.file_type,
+                "file_desc": data.file_desc,
+            }
+        return data
+    
+    @field_validator("file_data", mode="before")
+    @classmethod
+    def encode_file_data(cls, value):
+        if isinstance(value, (bytes, memoryview)):
+            return base64.b64encode(value).decode("ascii")
+        return value
     
     class Config:
         from_attributes = True
@@ -157,7 +193,7 @@ class BankLetterRequestResponse(BaseModel):
         from_attributes = True
 
 class BankLetterRequestUpdate(BaseModel):
-    status: str
+    status: RequestStatus
     approver_comments: Optional[str] = None
 
 # Visa Letter Request Schemas
@@ -189,7 +225,7 @@ class VisaLetterRequestResponse(BaseModel):
         from_attributes = True
 
 class VisaLetterRequestUpdate(BaseModel):
-    status: str
+    status: RequestStatus
     approver_comments: Optional[str] = None
 
 # Generic Response Schemas
@@ -475,6 +511,13 @@ class CourseResponse(CourseBase):
     duration_str: Optional[str] = None
     department_categories: Optional[List[str]] = None
 
+    @model_validator(mode="after")
+    def department_categories_from_context(self, info: ValidationInfo):
+        # Listings pass the caller's categories as validation context instead of setting them on each row
+        if self.department_categories is None and info.context:
+            self.department_categories = info.context.get("department_categories")
+        return self
+
     class Config:
         from_attributes = True
         use_enum_values = True
@@ -7,7 +7,6 @@ def reset_lms_data():
     try:
         # Delete all courses
         session.query(Course).delete()
-        session.commit()
 
         today = date.today()
 
@@ -125,6 +124,7 @@ def reset_lms_data():
 
         courses = ongoing_courses + upcoming_courses
         session.add_all(courses)
+        # Delete and re-insert in one transaction so a failure leaves the old courses in place
         session.commit()
     finally:
         session.close()
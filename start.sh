@@ -17,6 +17,9 @@ fi
 echo "📦 Installing dependencies..."
 pip install -r requirements.txt
 
+echo "🗄️ Applying database migrations..."
+alembic upgrade head
+
 echo "🗄️ Initializing database..."
 python3 init_db.py
 
@@ -1,6 +1,13 @@
+import base64
+from datetime import date, datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from models import User
 from fastapi import HTTPException, status
+from typing import List
+from pydantic import TypeAdapter
+from cache import manager_cache, team_cache, get_or_load, get_or_load_shared, get_or_load_shared_sync, team_key
 
 def is_manager(db: Session, user: User) -> bool:
     """
@@ -13,9 +20,51 @@ def is_manager(db: Session, user: User) -> bool:
     Returns:
         bool: True if user is a manager, False otherwise
     """
-    # Check if any user has this user as their manager
-    subordinates = db.query(User).filter(User.manager_id == user.id).first()
-    return subordinates is not None
+    # Check if any user has this user as their manager. Every manager-guarded call asks this,
+    # and reporting lines rarely change, so the answer is cached per user for a short while.
+    subordinate_ids = db.info.get(("subordinate_ids", user.id))
+    if subordinate_ids is not None:
+        return bool(subordinate_ids)
+    def has_subordinates():
+        return db.query(db.query(User.id).filter(User.manager_id == user.id).exists()).scalar()
+    return get_or_load(manager_cache, user.id, has_subordinates)
+
+_TEAM_ADAPTER = TypeAdapter(List[int])
+
+def _subordinate_ids(db: Session, manager: User) -> frozenset:
+    """
+    Ids of the manager's direct reports. Reporting lines change rarely, so the list is shared
+    across workers through the team cache (Redis when configured) and memoized in Session.info,
+    which makes every permission check in a request reuse one lookup.
+    Async handlers call load_subordinate_ids first, so the blocking Redis client is never used
+    from inside run_sync on the event loop.
+    """
+    key = ("subordinate_ids", manager.id)
+    subordinate_ids = db.info.get(key)
+    if subordinate_ids is None:
+        def load_team():
+            return [user_id for (user_id,) in db.query(User.id).filter(User.manager_id == manager.id)]
+        subordinate_ids = frozenset(
+            get_or_load_shared_sync(team_cache, manager.id, team_key(manager.id), _TEAM_ADAPTER, load_team)
+        )
+        db.info[key] = subordinate_ids
+    return subordinate_ids
+
+async def load_subordinate_ids(db: AsyncSession, manager: User) -> frozenset:
+    """
+    _subordinate_ids for async handlers: resolves the team through the async Redis client and
+    memoizes it in the same Session.info slot that the sync permission helpers read under run_sync.
+    """
+    key = ("subordinate_ids", manager.id)
+    subordinate_ids = db.info.get(key)
+    if subordinate_ids is None:
+        async def load_team():
+            return list(await db.scalars(select(User.id).where(User.manager_id == manager.id)))
+        subordinate_ids = frozenset(
+            await get_or_load_shared(team_cache, manager.id, team_key(manager.id), _TEAM_ADAPTER, load_team)
+        )
+        db.info[key] = subordinate_ids
+    return subordinate_ids
 
 def is_subordinate(db: Session, manager: User, user_id: int) -> bool:
     """
@@ -29,12 +78,8 @@ def is_subordinate(db: Session, manager: User, user_id: int) -> bool:
     Returns:
         bool: True if user is a subordinate of the manager, False otherwise
     """
-    # Get the target user
-    target_user = db.query(User).filter(User.id == user_id).first()
-    if not target_user:
-        return False
-    # Check if target user's manager is the given manager
-    return target_user.manager_id == manager.id
+    # Listings check many rows against the same manager: answer from the request's memo of direct reports
+    return user_id in _subordinate_ids(db, manager)
 
 def verify_manager_permission(db: Session, current_user: User, target_user_id: int) -> None:
     """
@@ -49,14 +94,47 @@ def verify_manager_permission(db: Session, current_user: User, target_user_id: i
     Raises:
         HTTPException: If current user is not a manager or target user is not their subordinate
     """
+    # A direct report implies the current user is a manager, so the common (allowed) case
+    # costs a single query; is_manager only decides which error to raise
+    if is_subordinate(db, current_user, target_user_id):
+        return
+    
     if not is_manager(db, current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only managers can perform this action"
         )
     
-    if not is_subordinate(db, current_user, target_user_id):
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="You can only perform this action for your direct subordinates"
+    )
+
+async def utc_today() -> date:
+    """
+    Today's UTC date, read once per request when used as a dependency (Depends(utc_today)).
+    Async so FastAPI calls it inline instead of queueing it on the DB-sized threadpool.
+    """
+    return datetime.now(timezone.utc).date()
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode a (created_at, id) keyset position as an opaque URL-safe cursor
+    """
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{row_id}".encode()).decode()
+
+def decode_cursor(cursor: str):
+    """
+    Decode a cursor produced by encode_cursor back into (created_at, id).
+    
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only perform this action for your direct subordinates"
-        ) 
\ No newline at end of file
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )